@@ -1,8 +1,52 @@
 from PySide6.QtWidgets import QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout, QGraphicsDropShadowEffect, QPushButton
-from PySide6.QtGui import QFont, QPixmap, QColor, QPainter
-from PySide6.QtCore import Qt, QPropertyAnimation, QRectF
-import subprocess
+from PySide6.QtGui import QFont, QColor, QPainter, QShortcut, QKeySequence
+from PySide6.QtCore import Qt, QPropertyAnimation, QRectF, QTimer, QEvent
+from collections import OrderedDict
+import importlib
+import logging
+import os
+import time
 import mysql.connector
+from db_trace import TracedConnection, QueryStatsPanel
+from analytics import fetch_series
+from anomaly import AnomalyDetector
+from reminder import ReminderFeature
+from stall_watchdog import watch
+from metrics import start_exporters
+from zygote import ZygoteLauncher
+from image_cache import BACKGROUND, LOGO
+import image_cache
+import metrics
+import profiling
+import timeline
+
+# Tracker button -> (module, window class); windows are hosted in this process
+TRACKERS = {
+    "Mood": ("mood", "MoodTracker"),
+    "Sleep": ("Sleep", "SleepTracker"),
+    "Meditation": ("med", "MeditationExercise"),
+    "Gratitude": ("gra", "GratitudeTracker"),
+    "Water": ("Water_tracker", "WaterTracker"),
+}
+
+# Set WELLHIVE_SEPARATE_PROCESSES=1 to launch each tracker as its own script instead;
+# on Linux the scripts are forked from a warm zygote process (WELLHIVE_ZYGOTE=0 cold-starts each one)
+TRACKER_SCRIPTS = {
+    "Mood": "mood.py",
+    "Sleep": "Sleep.py",
+    "Meditation": "med.py",
+    "Gratitude": "gra.py",
+    "Water": "Water_tracker.py",
+    "Reminder": "reminder.py",
+}
+
+# Trackers built ahead of use, in idle time after the home screen first paints (WELLHIVE_PREWARM=0 turns it off)
+PREWARM = os.environ.get("WELLHIVE_PREWARM", "1") != "0"
+PREWARM_ORDER = ("Mood", "Water", "Sleep", "Gratitude", "Meditation")
+# Hidden tracker windows kept alive for instant reopening; the least recently used are closed first
+MAX_HIDDEN_WINDOWS = int(os.environ.get("WELLHIVE_MAX_HIDDEN_WINDOWS", "3"))
+
+log = logging.getLogger("wellhive.home")
 
 class SelfCareApp(QWidget):
     def __init__(self):
@@ -31,16 +75,69 @@ class SelfCareApp(QWidget):
 
         # Set up database connection for mood tracker
         try:
-            self.db_conn = mysql.connector.connect(
+            self.db_conn = TracedConnection(mysql.connector.connect(
                 host="localhost",
                 user="root",
                 password="1234",
                 database="wellhive",
-            )
+            ))
         except mysql.connector.Error as e:
             print(f"Database connection error: {e}")
             exit()
 
+        # Optional Prometheus export (WELLHIVE_METRICS_TEXTFILE / WELLHIVE_METRICS_PORT)
+        self.metrics_timer = start_exporters(self)
+
+        # Debug panel with per-statement query latency
+        self.query_stats_panel = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, self.show_query_stats)
+
+        # Tracker windows in least to most recently used order, created on first use or pre-warmed
+        self.separate_processes = os.environ.get("WELLHIVE_SEPARATE_PROCESSES") == "1"
+        self.launcher = ZygoteLauncher(self.tracker_process_args(), self) if self.separate_processes else None
+        self.tracker_windows = OrderedDict()
+        self.prepared_modules = set()
+        self.pending_opens = {}  # window -> (tracker name, open start, warm) until its first paint
+
+        # Pre-warming runs one slice per timeout; a zero interval only fires once no events are waiting
+        self.prewarm_queue = []
+        self.prewarm_enabled = PREWARM and not self.separate_processes
+        self.first_paint_done = False
+        self.prewarm_timer = QTimer(self)
+        self.prewarm_timer.setInterval(0)
+        self.prewarm_timer.timeout.connect(self.prewarm_step)
+
+        # Anomalies in water, sleep and mood saves become ad-hoc reminders
+        self.reminder = ReminderFeature()
+        watch(self.reminder, "Reminder")
+        self.anomaly_detector = AnomalyDetector(parent=self)
+        self.anomaly_detector.anomaly_detected.connect(self.reminder.push_notification)
+        self.history_loaded = False
+
+    def load_history(self):
+        """Backfills the anomaly detector and hydration pacing from stored history; retried until it succeeds."""
+        if self.history_loaded:
+            return
+        try:
+            # A fresh database has none of these tables until their trackers create them
+            for tracker_name in ("Mood", "Sleep", "Water"):
+                self.prepare_tracker_module(tracker_name)
+            series = fetch_series(self.db_conn)
+            self.anomaly_detector.backfill(series)
+            # Seed hydration pacing with the latest day's total
+            dates, totals = series["water"]
+            if len(dates):
+                self.reminder.update_water_intake(str(dates[-1]), float(totals[-1]))
+        except mysql.connector.Error as e:
+            log.warning("Could not load history for anomaly detection: %s", e)
+            # Leave the shared connection usable for the trackers: no unread result, no open transaction
+            try:
+                self.db_conn.rollback()
+            except mysql.connector.Error as rollback_error:
+                log.warning("Could not roll back after the failed history load: %s", rollback_error)
+            return
+        self.history_loaded = True
+
     def create_welcome_container(self):
         """Creates the welcome message container."""
         container = QWidget()
@@ -88,12 +185,12 @@ class SelfCareApp(QWidget):
 
         # Add tracker buttons with hover animations
         for text, icon in [
-            ("Mood", "C:/kio/145/logo.png"),
-            ("Sleep", "C:/kio/145/logo.png"),
-            ("Meditation", "C:/kio/145/logo.png"),
-            ("Gratitude", "C:/kio/145/logo.png"),
-            ("Water", "C:/kio/145/logo.png"),
-            ("Reminder", "C:/kio/145/logo.png"),  # New Reminder Button
+            ("Mood", LOGO),
+            ("Sleep", LOGO),
+            ("Meditation", LOGO),
+            ("Gratitude", LOGO),
+            ("Water", LOGO),
+            ("Reminder", LOGO),  # New Reminder Button
         ]:
             button = self.create_tracker_button(text, icon)
             layout.addWidget(button)
@@ -103,7 +200,7 @@ class SelfCareApp(QWidget):
 
         return container
 
-    def create_tracker_button(self, text, icon_path):
+    def create_tracker_button(self, text, icon_name):
         """Creates a tracker button with hover animation."""
         button = QPushButton()
         button.setFixedSize(140, 140)
@@ -130,8 +227,7 @@ class SelfCareApp(QWidget):
 
         # Icon
         icon = QLabel()
-        pixmap = QPixmap(icon_path).scaled(50, 50, Qt.KeepAspectRatio, Qt.SmoothTransformation)  # Smaller size
-        icon.setPixmap(pixmap)
+        icon.setPixmap(image_cache.pixmap(icon_name, (50, 50)))  # decoded and scaled once for all buttons
         icon.setAlignment(Qt.AlignCenter)
         layout.addWidget(icon)
 
@@ -151,20 +247,142 @@ class SelfCareApp(QWidget):
 
         return button
 
+    @profiling.action("open")
     def open_tracker(self, tracker_name):
-        """Opens the respective tracker by running the appropriate Python script."""
-        trackers = {
-            "Mood": "mood.py",
-            "Sleep": "Sleep.py",
-            "Meditation": "med.py",
-            "Gratitude": "gra.py",
-            "Water": "Water.py",
-            "Reminder": "Remender.py"  # New Reminder Script
-        }
-
-        script = trackers.get(tracker_name)
+        """Shows the respective tracker window, creating it on first use."""
+        if self.separate_processes:
+            self.launch_tracker_process(tracker_name)
+            return
+
+        started = time.perf_counter()
+        if tracker_name == "Reminder":
+            window = self.reminder
+            warm = True
+        else:
+            window = self.tracker_windows.get(tracker_name)
+            warm = window is not None
+            if window is None:
+                self.prewarm_queue = [item for item in self.prewarm_queue if item[1] != tracker_name]
+                try:
+                    window = self.create_tracker(tracker_name)
+                except mysql.connector.Error as e:
+                    print(f"Failed to open {tracker_name} tracker: {e}")
+                    return
+                self.add_tracker_window(tracker_name, window)
+            self.tracker_windows.move_to_end(tracker_name)
+        # An open counts as done once the window has painted, not when show() returns
+        if window.isVisible():
+            self.record_open(tracker_name, started, warm)
+        elif window not in self.pending_opens:
+            self.pending_opens[window] = (tracker_name, started, warm)
+            window.installEventFilter(self)
+        window.show()
+        window.raise_()
+        window.activateWindow()
+        self.evict_hidden_windows()
+
+    def record_open(self, tracker_name, started, warm):
+        metrics.observe("wellhive_tracker_open_seconds", time.perf_counter() - started,
+                        tracker=tracker_name, warm="true" if warm else "false")
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint and watched in self.pending_opens:
+            watched.removeEventFilter(self)
+            self.record_open(*self.pending_opens.pop(watched))
+        return super().eventFilter(watched, event)
+
+    def add_tracker_window(self, tracker_name, window):
+        self.tracker_windows[tracker_name] = window
+        watch(window, tracker_name)
+
+    def evict_hidden_windows(self):
+        """Close the least recently used hidden tracker windows beyond MAX_HIDDEN_WINDOWS."""
+        hidden = [name for name, window in self.tracker_windows.items() if not window.isVisible()]
+        for name in hidden[:max(len(hidden) - MAX_HIDDEN_WINDOWS, 0)]:
+            window = self.tracker_windows.pop(name)
+            self.pending_opens.pop(window, None)
+            window.close()
+            window.deleteLater()
+
+    def start_prewarm(self):
+        """Queue pre-warming of the trackers not opened yet, up to the hidden window cap."""
+        names = [name for name in PREWARM_ORDER if name not in self.tracker_windows]
+        names = names[:max(MAX_HIDDEN_WINDOWS - len(self.tracker_windows), 0)]
+        # Small slices, so input that arrives meanwhile waits for at most one of them
+        self.prewarm_queue = [(step, name) for name in names for step in ("import", "build", "load", "polish")]
+        if self.prewarm_queue:
+            self.prewarm_timer.start()
+
+    def prewarm_step(self):
+        """Run one pre-warming slice: import and create tables, build the hidden window, run one of its reads, or polish it."""
+        if not self.prewarm_queue:
+            self.prewarm_timer.stop()
+            return
+        step, tracker_name = self.prewarm_queue.pop(0)
+        with timeline.span(f"prewarm.{step}", "prewarm", tracker=tracker_name):
+            try:
+                if step == "import":
+                    self.prepare_tracker_module(tracker_name)
+                elif step == "build":
+                    window = self.create_tracker(tracker_name)
+                    self.add_tracker_window(tracker_name, window)
+                    # Pre-warmed windows have not been used yet, so they are the first to go
+                    self.tracker_windows.move_to_end(tracker_name, last=False)
+                elif step == "load":
+                    # One database read per slice; reads still pending when the window opens run on show
+                    window = self.tracker_windows.get(tracker_name)
+                    if hasattr(window, "load_next") and window.load_next():
+                        self.prewarm_queue.insert(0, ("load", tracker_name))
+                elif tracker_name in self.tracker_windows:
+                    window = self.tracker_windows[tracker_name]
+                    window.ensurePolished()
+                    window.layout().activate()
+            except mysql.connector.Error as e:
+                print(f"Could not pre-warm {tracker_name} tracker: {e}")
+                self.prewarm_queue = [item for item in self.prewarm_queue if item[1] != tracker_name]
+
+    def prepare_tracker_module(self, tracker_name):
+        """Imports a tracker module and ensures its tables exist, once per run."""
+        module_name, class_name = TRACKERS[tracker_name]
+        module = importlib.import_module(module_name)
+        if module_name not in self.prepared_modules:
+            module.create_tables(self.db_conn)
+            self.prepared_modules.add(module_name)
+        return getattr(module, class_name)
+
+    def create_tracker(self, tracker_name):
+        """Imports a tracker module, ensures its tables exist and builds its window."""
+        self.load_history()  # the detector must hold the history before any save reaches it
+        tracker_class = self.prepare_tracker_module(tracker_name)
+
+        if tracker_name == "Meditation":
+            return tracker_class(self.db_conn)
+        if tracker_name == "Water":
+            window = tracker_class(self.db_conn, BACKGROUND, anomaly_detector=self.anomaly_detector)
+            window.day_total_changed.connect(self.reminder.update_water_intake)
+            return window
+        if tracker_name in ("Mood", "Sleep"):
+            return tracker_class(self.db_conn, BACKGROUND, anomaly_detector=self.anomaly_detector)
+        return tracker_class(self.db_conn, BACKGROUND)
+
+    def launch_tracker_process(self, tracker_name):
+        """Opens the respective tracker script in its own process."""
+        script = TRACKER_SCRIPTS.get(tracker_name)
         if script:
-            subprocess.Popen(["C:/kio/145/.venv/Scripts/python.exe", f"C:/kio/145/{script}"])
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), script)
+            self.launcher.launch(path, self.tracker_process_args())
+
+    def tracker_process_args(self):
+        """Command-line arguments passed on to tracker processes."""
+        return [f"--profile={profiling.directory}"] if profiling.directory else []
+
+    def show_query_stats(self):
+        """Opens the query latency debug panel (Ctrl+Shift+D)."""
+        if self.query_stats_panel is None:
+            self.query_stats_panel = QueryStatsPanel()
+        self.query_stats_panel.refresh()
+        self.query_stats_panel.show()
+        self.query_stats_panel.raise_()
 
     def animate_button_hover(self, button, enlarge):
         """Animates the button on hover."""
@@ -199,8 +417,8 @@ class SelfCareApp(QWidget):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing)
 
-        # Draw the background image
-        bg_pixmap = QPixmap("C:/kio/145/hji.png")
+        # Draw the background image, pre-scaled to the window so repaints only blit it
+        bg_pixmap = image_cache.pixmap(BACKGROUND, (self.width(), self.height()), Qt.IgnoreAspectRatio)
         painter.drawPixmap(self.rect(), bg_pixmap)
 
         # Glassmorphism overlay
@@ -212,11 +430,19 @@ class SelfCareApp(QWidget):
         painter.setPen(Qt.NoPen)
         painter.drawRoundedRect(rect, 20, 20)
 
+        # Load history and build tracker windows once the home screen is on screen
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            QTimer.singleShot(0, self.load_history)
+            if self.prewarm_enabled:
+                self.start_prewarm()
+
 
 if __name__ == "__main__":
     app = QApplication([])
 
     window = SelfCareApp()
     window.show()
+    watch(window, "Homepage")
 
     app.exec()
@@ -0,0 +1,256 @@
+import time
+import numpy as np
+import mysql.connector
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QTextEdit, QPushButton, QMessageBox
+from PySide6.QtCore import Qt
+
+# Valence used to turn mood labels into a number that can be correlated.
+# It is stored in moods.valence so the database can average check-ins per day.
+MOOD_SCORES = {"Angry": -2, "Sad": -1, "Stressed": -1, "Neutral": 0, "Happy": 1, "Excited": 2}
+
+SERIES_QUERIES = {
+    "sleep": "SELECT date, duration FROM sleep_entries ORDER BY date",
+    "water": "SELECT date, intake FROM water_daily ORDER BY date",
+    "mood": """
+        SELECT DATE(c.checked_at) AS day, AVG(m.valence)
+        FROM mood_checkins c
+        JOIN moods m ON m.code = c.mood_code
+        GROUP BY day
+        ORDER BY day
+    """,
+}
+
+
+def fetch_series(db_conn):
+    """Fetch each tracker's rows as (dates, values) NumPy arrays."""
+    cursor = db_conn.cursor()
+    series = {}
+    for name, query in SERIES_QUERIES.items():
+        cursor.execute(query)
+        rows = cursor.fetchall()
+        dates = np.array([row[0] for row in rows], dtype="datetime64[D]")
+        values = np.array([row[1] for row in rows], dtype=float)
+        series[name] = (dates, values)
+    return series
+
+
+def align_series(series):
+    """Place every series on one dense daily index, with NaN for missing days.
+
+    Returns (index, {name: values}) where all value arrays share index's length.
+    """
+    non_empty = [dates for dates, _ in series.values() if len(dates)]
+    if not non_empty:
+        return np.array([], dtype="datetime64[D]"), {name: np.array([]) for name in series}
+
+    start = min(dates.min() for dates in non_empty)
+    end = max(dates.max() for dates in non_empty)
+    index = np.arange(start, end + 1, dtype="datetime64[D]")
+
+    aligned = {}
+    for name, (dates, values) in series.items():
+        dense = np.full(len(index), np.nan)
+        dense[(dates - start).astype(int)] = values
+        aligned[name] = dense
+    return index, aligned
+
+
+def lagged_correlation(x, y, lag):
+    """Pearson correlation of x[t] with y[t + lag], ignoring days where either is missing."""
+    if lag > 0:
+        x, y = x[:-lag], y[lag:]
+    mask = ~(np.isnan(x) | np.isnan(y))
+    if mask.sum() < 3:
+        return np.nan
+    x, y = x[mask], y[mask]
+    x = x - x.mean()
+    y = y - y.mean()
+    denominator = np.sqrt((x * x).sum() * (y * y).sum())
+    if denominator == 0:
+        return np.nan
+    return float((x * y).sum() / denominator)
+
+
+def rolling_sum(values, window):
+    """Trailing sums and counts of present values over window days, via cumulative sums."""
+    present = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(present, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(present)))
+    lower = np.maximum(np.arange(1, len(values) + 1) - window, 0)
+    return sums[1:] - sums[lower], counts[1:] - counts[lower]
+
+
+def rolling_mean(values, window, min_periods=1):
+    """Trailing mean over window days, skipping missing days."""
+    window_sums, window_counts = rolling_sum(values, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = window_sums / window_counts
+    means[window_counts < min_periods] = np.nan
+    return means
+
+
+def mood_conditional_means(values, mood, lag=1):
+    """Mean of values on day t, grouped by the (rounded) mood score on day t + lag."""
+    if lag > 0:
+        values, mood = values[:-lag], mood[lag:]
+    mask = ~(np.isnan(values) | np.isnan(mood))
+    scores = np.rint(mood[mask]).astype(int)
+    offset = -min(MOOD_SCORES.values())
+    sums = np.bincount(scores + offset, weights=values[mask], minlength=len(set(MOOD_SCORES.values())))
+    counts = np.bincount(scores + offset, minlength=len(sums))
+    result = {}
+    for bucket in np.nonzero(counts)[0]:
+        result[int(bucket) - offset] = float(sums[bucket] / counts[bucket])
+    return result
+
+
+def sleep_midpoint_hours(bedtimes, wake_times):
+    """Clock hour of each sleep interval's midpoint, wrapped to [-12, 12) around midnight."""
+    missing = np.isnat(bedtimes) | np.isnat(wake_times)
+    midpoints = bedtimes + (wake_times - bedtimes) // 2
+    seconds = (midpoints - midpoints.astype("datetime64[D]")).astype("timedelta64[s]").astype(float)
+    hours = (seconds / 3600 + 12) % 24 - 12
+    hours[missing] = np.nan
+    return hours
+
+
+def analyse_sleep(rows, target_hours, window=14):
+    """Sleep debt, regularity and rolling averages from (date, duration, bedtime, wake_time) rows.
+
+    Everything is computed in one pass of array operations over the whole history.
+    """
+    if not rows:
+        return None
+    dates = np.array([row[0] for row in rows], dtype="datetime64[D]")
+    durations = np.array([row[1] for row in rows], dtype=float)
+    bedtimes = np.array([row[2] for row in rows], dtype="datetime64[s]")
+    wake_times = np.array([row[3] for row in rows], dtype="datetime64[s]")
+
+    midpoints = sleep_midpoint_hours(bedtimes, wake_times)
+    index, aligned = align_series({"sleep": (dates, durations), "midpoint": (dates, midpoints)})
+    sleep, midpoint = aligned["sleep"], aligned["midpoint"]
+
+    rolling = rolling_mean(sleep, window)
+    debt, _ = rolling_sum(target_hours - sleep, window)
+    recent_midpoints = midpoint[-window:]
+
+    with np.errstate(invalid="ignore"):
+        return {
+            "nights": int((~np.isnan(sleep)).sum()),
+            "average": float(np.nanmean(sleep)),
+            "rolling_average": float(rolling[-1]),
+            "best_rolling_average": float(np.nanmax(rolling)),
+            "worst_rolling_average": float(np.nanmin(rolling)),
+            "debt": float(debt[-1]),
+            "worst_debt": float(np.nanmax(debt)),
+            "regularity": float(np.nanstd(recent_midpoints)) if (~np.isnan(recent_midpoints)).any() else np.nan,
+            "overall_regularity": float(np.nanstd(midpoint)) if (~np.isnan(midpoint)).any() else np.nan,
+            "window": window,
+        }
+
+
+def format_sleep_analysis(results, target_hours, elapsed_ms):
+    if results is None:
+        return "No sleep data available."
+    window = results["window"]
+
+    def hours(value):
+        return "n/a" if np.isnan(value) else f"{value:.2f} h"
+
+    report = f"Sleep Analysis over {results['nights']} nights (computed in {elapsed_ms:.1f} ms)\n"
+    report += f"  Average sleep: {hours(results['average'])}\n"
+    report += f"  {window}-day average: {hours(results['rolling_average'])}"
+    report += f" (best {hours(results['best_rolling_average'])}, worst {hours(results['worst_rolling_average'])})\n"
+    report += f"  Sleep debt vs {target_hours:g} h goal, last {window} days: {hours(results['debt'])}"
+    report += f" (worst ever {hours(results['worst_debt'])})\n"
+    report += f"  Regularity (std. dev. of sleep midpoint), last {window} nights: {hours(results['regularity'])}"
+    report += f" (all time {hours(results['overall_regularity'])})\n"
+    return report
+
+
+def analyse(index, aligned, max_lag=3):
+    """Compute every insight shown in the Insights tab from aligned series."""
+    results = {"days": len(index), "correlations": {}, "rolling": {}, "by_mood": {}}
+    for name in ("sleep", "water"):
+        results["correlations"][name] = [
+            lagged_correlation(aligned[name], aligned["mood"], lag) for lag in range(max_lag + 1)
+        ]
+        results["by_mood"][name] = mood_conditional_means(aligned[name], aligned["mood"], lag=1)
+    for name in ("sleep", "water", "mood"):
+        results["rolling"][name] = {
+            window: rolling_mean(aligned[name], window)[-1] if len(index) else np.nan
+            for window in (7, 30)
+        }
+    return results
+
+
+def format_insights(results, elapsed_ms):
+    if not results["days"]:
+        return "No tracker data available yet."
+
+    mood_names = {}
+    for mood, score in MOOD_SCORES.items():
+        mood_names.setdefault(score, []).append(mood)
+
+    def average(value):
+        return "n/a" if np.isnan(value) else f"{value:.2f}"
+
+    report = f"Insights over {results['days']} days (computed in {elapsed_ms:.1f} ms)\n\n"
+
+    report += "Correlation with mood (lag = days until the mood entry):\n"
+    for name, label in (("sleep", "Sleep duration"), ("water", "Water intake")):
+        values = ", ".join(
+            f"lag {lag}: {value:+.2f}" if not np.isnan(value) else f"lag {lag}: n/a"
+            for lag, value in enumerate(results["correlations"][name])
+        )
+        report += f"  {label}: {values}\n"
+
+    report += "\nRolling averages (last 7 / 30 days):\n"
+    for name, label, unit in (("sleep", "Sleep", "hours"), ("water", "Water", "liters"), ("mood", "Mood score", "")):
+        rolling = results["rolling"][name]
+        report += f"  {label}: {average(rolling[7])} / {average(rolling[30])} {unit}\n"
+
+    report += "\nAverage the day before each mood:\n"
+    for score in sorted(mood_names):
+        sleep = results["by_mood"]["sleep"].get(score)
+        water = results["by_mood"]["water"].get(score)
+        if sleep is None and water is None:
+            continue
+        sleep_text = f"{sleep:.1f} h sleep" if sleep is not None else "no sleep data"
+        water_text = f"{water:.1f} L water" if water is not None else "no water data"
+        report += f"  {'/'.join(mood_names[score])}: {sleep_text}, {water_text}\n"
+
+    return report
+
+
+class InsightsTab(QWidget):
+    """Cross-tracker insights: does sleep or water predict the next day's mood?"""
+
+    def __init__(self, db_conn, parent=None):
+        super().__init__(parent)
+        self.db_conn = db_conn
+
+        layout = QVBoxLayout(self)
+
+        self.insights_box = QTextEdit(self)
+        self.insights_box.setPlaceholderText("Insights will be displayed here...")
+        self.insights_box.setReadOnly(True)
+        layout.addWidget(self.insights_box)
+
+        refresh_button = QPushButton("Compute Insights")
+        refresh_button.clicked.connect(self.show_insights)
+        layout.addWidget(refresh_button, alignment=Qt.AlignCenter)
+
+    def show_insights(self):
+        try:
+            series = fetch_series(self.db_conn)
+        except mysql.connector.Error as e:
+            QMessageBox.critical(self, "Error", f"Failed to load tracker data: {e}")
+            return
+
+        started = time.perf_counter()
+        index, aligned = align_series(series)
+        results = analyse(index, aligned)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        self.insights_box.setPlainText(format_insights(results, elapsed_ms))
@@ -0,0 +1,217 @@
+import math
+import numpy as np
+from PySide6.QtCore import QObject, Signal
+from goals import to_date
+
+
+def linear_recurrence(inputs, decay, initial, chunk=128):
+    """Solve y[t] = decay * y[t-1] + inputs[t] for every t with array operations.
+
+    Within a chunk, y[t] = decay**t * (decay * y0 + cumsum(inputs[i] / decay**i)).
+    Working in chunks keeps decay**-i within floating point range for any length.
+    """
+    result = np.empty(len(inputs))
+    previous = initial
+    powers = decay ** np.arange(chunk)
+    for start in range(0, len(inputs), chunk):
+        block = inputs[start:start + chunk]
+        scale = powers[:len(block)]
+        values = scale * (decay * previous + np.cumsum(block / scale))
+        result[start:start + len(block)] = values
+        previous = values[-1]
+    return result
+
+
+class EwmaStat:
+    """Exponentially weighted mean and variance kept in O(1) state."""
+
+    def __init__(self, alpha):
+        self.alpha = alpha
+        self.mean = None
+        self.variance = 0.0
+        self.count = 0
+        self.previous = None  # (mean, variance, count) before the latest value, for revert()
+
+    def zscore(self, value):
+        """How many standard deviations value is from the current mean."""
+        if self.mean is None or self.variance <= 0:
+            return 0.0
+        return (value - self.mean) / math.sqrt(self.variance)
+
+    def update(self, value):
+        self.previous = (self.mean, self.variance, self.count)
+        if self.mean is None:
+            self.mean = value
+        else:
+            delta = value - self.mean
+            self.mean += self.alpha * delta
+            self.variance = (1 - self.alpha) * (self.variance + self.alpha * delta * delta)
+        self.count += 1
+
+    def revert(self):
+        """Take back the latest value, so a corrected one can replace it."""
+        if self.previous is not None:
+            self.mean, self.variance, self.count = self.previous
+            self.previous = None
+
+    def backfill(self, values):
+        """Fold a whole history into the state in one vectorized pass.
+
+        Returns the z-score each value had against the state before it, so
+        historic anomalies can be inspected without replaying them one by one.
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return np.array([])
+
+        start = 0
+        if self.mean is None:
+            self.previous = (None, 0.0, 0)
+            self.mean = values[0]
+            self.count = 1
+            start = 1
+        rest = values[start:]
+        if not len(rest):
+            return np.zeros(len(values))
+
+        a = self.alpha
+        means = linear_recurrence(a * rest, 1 - a, self.mean)
+        previous_means = np.concatenate(([self.mean], means[:-1]))
+        deltas = rest - previous_means
+        variances = linear_recurrence((1 - a) * a * deltas * deltas, 1 - a, self.variance)
+        previous_variances = np.concatenate(([self.variance], variances[:-1]))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            zscores = np.where(previous_variances > 0, deltas / np.sqrt(previous_variances), 0.0)
+
+        self.previous = (float(previous_means[-1]), float(previous_variances[-1]), self.count + len(rest) - 1)
+        self.mean = float(means[-1])
+        self.variance = float(variances[-1])
+        self.count += len(rest)
+        return np.concatenate((np.zeros(start), zscores))
+
+
+class AnomalyDetector(QObject):
+    """Online detector over water, sleep and mood saves.
+
+    Each metric keeps an EWMA mean and variance. A value far below the user's
+    own norm is flagged, as is a run of short nights. Water is judged on a
+    finished day: a day's total is only scored once a later day is logged.
+
+    Each day counts once: saving the latest day again replaces its value,
+    and days older than the latest one seen are ignored.
+    """
+
+    anomaly_detected = Signal(str, str)  # activity, message
+
+    def __init__(self, alpha=0.1, z_threshold=2.5, warmup=14,
+                 short_sleep_hours=5.0, short_sleep_nights=3, parent=None):
+        super().__init__(parent)
+        self.z_threshold = z_threshold
+        self.warmup = warmup
+        self.short_sleep_hours = short_sleep_hours
+        self.short_sleep_nights = short_sleep_nights
+
+        self.stats = {metric: EwmaStat(alpha) for metric in ("water", "sleep", "mood")}
+        self.short_nights = 0
+        self.last_sleep_day = None
+        self.sleep_before = (0, None)  # (short_nights, last_sleep_day) before the latest night
+        self.last_mood_day = None
+        self.open_water_day = None
+        self.open_water_total = 0.0
+
+    def is_low(self, metric, value):
+        stat = self.stats[metric]
+        return stat.count >= self.warmup and stat.zscore(value) < -self.z_threshold
+
+    def observe_sleep(self, day, hours):
+        day = to_date(day)
+        if day is None or (self.last_sleep_day is not None and day < self.last_sleep_day):
+            return
+        if day == self.last_sleep_day:
+            # A re-save or edit of the latest night replaces it
+            self.stats["sleep"].revert()
+            self.short_nights, previous_day = self.sleep_before
+        else:
+            previous_day = self.last_sleep_day
+            self.sleep_before = (self.short_nights, previous_day)
+
+        consecutive = previous_day is not None and (day - previous_day).days == 1
+        if hours < self.short_sleep_hours:
+            self.short_nights = self.short_nights + 1 if consecutive or not self.short_nights else 1
+        else:
+            self.short_nights = 0
+        self.last_sleep_day = day
+
+        if self.short_nights == self.short_sleep_nights:
+            self.anomaly_detected.emit(
+                "Rest", f"You've slept under {self.short_sleep_hours:g} hours for "
+                        f"{self.short_sleep_nights} nights in a row. Try an early night?")
+        elif self.is_low("sleep", hours):
+            self.anomaly_detected.emit("Rest", f"Last night's {hours:.1f} hours is well below your usual sleep.")
+        self.stats["sleep"].update(hours)
+
+    def observe_water(self, day, total):
+        """Track today's running total; score the previous day once it is over."""
+        day = to_date(day)
+        if day is None:
+            return
+        if self.open_water_day is not None and day > self.open_water_day:
+            self.close_water_day()
+        if self.open_water_day is None or day >= self.open_water_day:
+            self.open_water_day = day
+            self.open_water_total = total
+
+    def close_water_day(self):
+        total = self.open_water_total
+        if self.is_low("water", total):
+            self.anomaly_detected.emit(
+                "Drink Water", f"You drank {total:.1f} liters on {self.open_water_day}, far below your usual intake.")
+        self.stats["water"].update(total)
+        self.open_water_day = None
+
+    def observe_mood(self, day, valence):
+        """Score a check-in; a later check-in on the same day replaces the earlier one."""
+        day = to_date(day)
+        if day is None or (self.last_mood_day is not None and day < self.last_mood_day):
+            return
+        if day == self.last_mood_day:
+            self.stats["mood"].revert()
+        self.last_mood_day = day
+
+        if self.is_low("mood", valence):
+            self.anomaly_detected.emit("Mood Check", "Your mood is well below your usual. Be kind to yourself today.")
+        self.stats["mood"].update(valence)
+
+    def backfill(self, series):
+        """Initialise every metric from {metric: (dates, values)} arrays in one pass each."""
+        for metric, (dates, values) in series.items():
+            if metric not in self.stats or not len(values):
+                continue
+            if metric == "water":
+                # The latest day may still be in progress; keep it open
+                self.stats["water"].backfill(values[:-1])
+                self.open_water_day = to_date(str(dates[-1]))
+                self.open_water_total = float(values[-1])
+            else:
+                self.stats[metric].backfill(values)
+
+            if metric == "sleep":
+                self.short_nights = self.short_run(dates, values)
+                self.last_sleep_day = to_date(str(dates[-1]))
+                previous_day = to_date(str(dates[-2])) if len(dates) > 1 else None
+                self.sleep_before = (self.short_run(dates[:-1], values[:-1]), previous_day)
+            elif metric == "mood":
+                self.last_mood_day = to_date(str(dates[-1]))
+
+    def short_run(self, dates, values):
+        """Length of the trailing run of consecutive short nights."""
+        if not len(values):
+            return 0
+        short = values < self.short_sleep_hours
+        gaps = np.diff(dates.astype(np.int64), prepend=dates[0].astype(np.int64) - 1) != 1
+        breaks = ~short | gaps
+        last_break = np.nonzero(breaks)[0]
+        run_start = last_break[-1] if len(last_break) else 0
+        return int(len(values) - run_start - (0 if short[run_start] else 1))
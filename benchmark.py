@@ -0,0 +1,286 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import json
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import mysql.connector
+from PySide6.QtWidgets import QApplication, QMessageBox, QFileDialog, QInputDialog
+from PySide6.QtCore import QDate
+from db_trace import TracedConnection
+from synthetic_data import generate, user_database
+from zygote import ZYGOTE_SCRIPT, supported
+from mood import MoodTracker
+from Sleep import SleepTracker
+from Water_tracker import WaterTracker
+from gra import GratitudeTracker
+from med import MeditationExercise
+
+# users x years of data, and how many of the users' databases are timed
+SCENARIOS = {
+    "1y": {"users": 1, "years": 1, "sampled": 1},
+    "10y": {"users": 1, "years": 10, "sampled": 1},
+    "1000u": {"users": 1000, "years": 1, "sampled": 10},
+}
+BASELINES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baselines.json")
+TOLERANCE = 0.25  # a median more than 25% over its baseline fails the run
+
+# Separate-process launch: imports what the Mood tracker needs and creates the QApplication, then signals
+LAUNCH_PROBE = """
+import sys
+sys.path.insert(0, {directory!r})
+import mood
+from PySide6.QtWidgets import QApplication
+app = QApplication(sys.argv[:1])
+open(sys.argv[1], "w").close()
+"""
+
+errors = []
+
+
+def silence_dialogs(output_dir):
+    """Answer every modal dialog so actions run unattended; error boxes are collected instead."""
+    QMessageBox.information = staticmethod(lambda *args, **kwargs: QMessageBox.Ok)
+    QMessageBox.warning = staticmethod(lambda *args, **kwargs: QMessageBox.Ok)
+
+    def critical(parent, title, text, *args, **kwargs):
+        errors.append(f"{type(parent).__name__}: {text}")
+        return QMessageBox.Ok
+
+    QMessageBox.critical = staticmethod(critical)
+    QFileDialog.getSaveFileName = staticmethod(
+        lambda parent, caption, name, *args, **kwargs: (os.path.join(output_dir, name), ""))
+    # The last period offered is the longest one, i.e. the heaviest report
+    QInputDialog.getItem = staticmethod(lambda parent, title, label, items, *args, **kwargs: (items[-1], True))
+
+
+def tracker_cases(db_conn):
+    """Benchmark name -> callable, for every timed action of every tracker."""
+    today = QDate.currentDate()
+
+    mood_window = MoodTracker(db_conn)
+    mood_window.value_edit.setCurrentIndex(1)
+    sleep_window = SleepTracker(db_conn)
+    water_window = WaterTracker(db_conn)
+    gratitude_window = GratitudeTracker(db_conn)
+    meditation_window = MeditationExercise(db_conn)
+
+    def save_water():
+        water_window.value_edit.setText("0.25")
+        water_window.save_entry()
+
+    def save_gratitude():
+        gratitude_window.value_edit.setPlainText("Grateful for a fast benchmark run.")
+        gratitude_window.save_entry()
+
+    return {
+        "mood.load_day_data": lambda: mood_window.load_day_data(today),
+        "mood.save_entry": mood_window.save_entry,
+        "mood.generate_report": mood_window.generate_report,
+        "mood.show_statistics": mood_window.show_statistics,
+        "mood.download_report_pdf": mood_window.download_report_pdf,
+        "sleep.load_day_data": lambda: sleep_window.load_day_data(today),
+        "sleep.save_entry": sleep_window.save_entry,
+        "sleep.generate_report": sleep_window.generate_report,
+        "sleep.show_statistics": sleep_window.show_statistics,
+        "sleep.download_report_pdf": sleep_window.download_report_pdf,
+        "water.load_day_data": lambda: water_window.load_day_data(today),
+        "water.save_entry": save_water,
+        "water.generate_report": water_window.generate_report,
+        "water.show_statistics": water_window.show_statistics,
+        "water.download_report_pdf": water_window.download_report_pdf,
+        "gratitude.load_day_data": lambda: gratitude_window.load_day_data(today),
+        "gratitude.save_entry": save_gratitude,
+        "gratitude.generate_report": gratitude_window.generate_report,
+        "gratitude.download_report_pdf": gratitude_window.download_report_pdf,
+        "meditation.show_statistics": meditation_window.show_statistics,
+    }
+
+
+def time_call(app, function):
+    """Milliseconds for one call, including the events it posts; closes any windows it opened."""
+    before = set(app.topLevelWidgets())
+    started = time.perf_counter()
+    function()
+    app.processEvents()
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for widget in set(app.topLevelWidgets()) - before:
+        widget.close()
+    return elapsed_ms
+
+
+def scratch_copy(args, database):
+    """Copy a generated database into a throwaway one, so the timed saves never grow the original.
+
+    Every run then starts from the same rows, however often the benchmark is repeated.
+    """
+    scratch = f"{database}_scratch"
+    db_conn = mysql.connector.connect(host=args.host, user=args.user, password=args.password)
+    cursor = db_conn.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS `{scratch}`")
+    cursor.execute(f"CREATE DATABASE `{scratch}`")
+    cursor.execute(
+        "SELECT table_name FROM information_schema.tables WHERE table_schema = %s AND table_type = 'BASE TABLE'",
+        (database,),
+    )
+    for (table,) in cursor.fetchall():
+        cursor.execute(f"CREATE TABLE `{scratch}`.`{table}` LIKE `{database}`.`{table}`")
+        cursor.execute(f"INSERT INTO `{scratch}`.`{table}` SELECT * FROM `{database}`.`{table}`")
+    db_conn.commit()
+    db_conn.close()
+    return scratch
+
+
+def drop_database(args, database):
+    db_conn = mysql.connector.connect(host=args.host, user=args.user, password=args.password)
+    db_conn.cursor().execute(f"DROP DATABASE IF EXISTS `{database}`")
+    db_conn.close()
+
+
+def run_scenario(app, name, args):
+    scenario = SCENARIOS[name]
+    if args.generate:
+        generate(scenario["users"], scenario["years"], args.host, args.user, args.password, f"{args.prefix}_{name}")
+
+    users = random.Random(0).sample(range(scenario["users"]), scenario["sampled"])
+    samples = {}
+    for index in users:
+        scratch = scratch_copy(args, user_database(f"{args.prefix}_{name}", index))
+        db_conn = TracedConnection(mysql.connector.connect(
+            host=args.host, user=args.user, password=args.password, database=scratch,
+        ))
+        cases = tracker_cases(db_conn)
+        for case, function in cases.items():
+            time_call(app, function)  # warm-up
+            samples.setdefault(case, []).extend(time_call(app, function) for _ in range(args.repeats))
+        db_conn.close()
+        drop_database(args, scratch)
+
+    return {case: statistics.median(values) for case, values in samples.items()}
+
+
+def wait_for_file(path):
+    while not os.path.exists(path):
+        time.sleep(0.001)
+
+
+def time_launches(repeats):
+    """Median ms to a ready tracker process, cold-started with Popen versus forked from the zygote."""
+    if not supported():
+        print("Forking trackers is not supported on this platform; skipping the launch benchmark")
+        return {}
+    probe_dir = tempfile.mkdtemp(prefix="wellhive_launch_")
+    probe = os.path.join(probe_dir, "probe.py")
+    with open(probe, "w", encoding="utf-8") as probe_file:
+        probe_file.write(LAUNCH_PROBE.format(directory=os.path.dirname(os.path.abspath(__file__))))
+
+    zygote = subprocess.Popen([sys.executable, ZYGOTE_SCRIPT], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+    if zygote.stdout.readline().strip() != "ready":
+        errors.append("zygote did not start")
+        return {}
+
+    samples = {"launch.popen": [], "launch.fork": []}
+    for attempt in range(repeats + 1):  # the first round is a warm-up
+        marker = os.path.join(probe_dir, f"popen-{attempt}")
+        started = time.perf_counter()
+        process = subprocess.Popen([sys.executable, probe, marker])
+        wait_for_file(marker)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        process.wait()
+        if attempt:
+            samples["launch.popen"].append(elapsed_ms)
+
+        marker = os.path.join(probe_dir, f"fork-{attempt}")
+        started = time.perf_counter()
+        zygote.stdin.write(json.dumps({"script": probe, "args": [marker]}) + "\n")
+        zygote.stdin.flush()
+        zygote.stdout.readline()
+        wait_for_file(marker)
+        if attempt:
+            samples["launch.fork"].append((time.perf_counter() - started) * 1000)
+
+    zygote.stdin.close()
+    zygote.wait()
+    return {case: statistics.median(values) for case, values in samples.items()}
+
+
+def compare(results, baselines):
+    """Print every result against its baseline; return the names of regressions and of cases without a baseline."""
+    regressions = []
+    missing = []
+    for scenario, cases in results.items():
+        print(f"\n{scenario}")
+        for case, median_ms in sorted(cases.items()):
+            baseline = baselines.get(scenario, {}).get(case)
+            if baseline is None:
+                print(f"  {case:<45} {median_ms:9.1f} ms  NO BASELINE")
+                missing.append(f"{scenario} {case}")
+                continue
+            change = median_ms / baseline - 1
+            flag = "  REGRESSION" if change > TOLERANCE else ""
+            print(f"  {case:<45} {median_ms:9.1f} ms  baseline {baseline:9.1f} ms  {change:+6.0%}{flag}")
+            if flag:
+                regressions.append(f"{scenario} {case}")
+    return regressions, missing
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Offscreen end-to-end benchmarks of the tracker actions.")
+    parser.add_argument("scenarios", nargs="*",
+                        help=f"data sizes to benchmark, from {', '.join(SCENARIOS)} (default: 1y unless --launch)")
+    parser.add_argument("--launch", action="store_true",
+                        help="also time separate tracker processes, cold-started versus forked from the zygote")
+    parser.add_argument("--generate", action="store_true", help="(re)create the synthetic databases first")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--update-baselines", action="store_true", help="store these results as the new baselines")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="1234")
+    parser.add_argument("--prefix", default="wellhive_bench")
+    args = parser.parse_args()
+    if not args.scenarios and not args.launch:
+        args.scenarios = ["1y"]
+    unknown = sorted(set(args.scenarios) - set(SCENARIOS))
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    app = QApplication(sys.argv[:1])
+    output_dir = tempfile.mkdtemp(prefix="wellhive_bench_")
+    silence_dialogs(output_dir)
+
+    try:
+        results = {name: run_scenario(app, name, args) for name in args.scenarios}
+        if args.launch:
+            results["launch"] = time_launches(args.repeats)
+    except mysql.connector.Error as e:
+        print(f"Error connecting to MySQL: {e}")
+        sys.exit(1)
+
+    baselines = {}
+    if os.path.exists(BASELINES_PATH):
+        with open(BASELINES_PATH, encoding="utf-8") as baseline_file:
+            baselines = json.load(baseline_file)
+    regressions, missing = compare(results, baselines)
+
+    if args.update_baselines:
+        baselines.update(results)
+        with open(BASELINES_PATH, "w", encoding="utf-8") as baseline_file:
+            json.dump(baselines, baseline_file, indent=2, sort_keys=True)
+        print(f"\nBaselines written to {BASELINES_PATH}")
+        regressions = missing = []
+
+    for error in errors:
+        print(f"Error during benchmark: {error}")
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) over {TOLERANCE:.0%}: " + ", ".join(regressions))
+    if missing:
+        # A case without a baseline could never fail, so it fails until one is recorded on this machine
+        print(f"\n{len(missing)} case(s) have no baseline in {BASELINES_PATH}; "
+              "record them with --update-baselines: " + ", ".join(missing))
+    sys.exit(1 if regressions or missing or errors else 0)
@@ -0,0 +1,147 @@
+from PySide6.QtWidgets import QApplication, QWidget
+from PySide6.QtGui import QPainter, QColor, QFont
+from PySide6.QtCore import Qt, QVariantAnimation, QEasingCurve, QElapsedTimer, QRectF, QPointF
+
+
+class BreathingCircle(QWidget):
+    """A circle that expands on the in-breath and contracts on the out-breath.
+
+    The radius is driven by a QVariantAnimation whose duration is the time left
+    until the pacer's next absolute deadline, so the visual never drifts from
+    the audio cues. Each frame only invalidates the rectangle covering the old
+    and new circle.
+    """
+
+    MIN_RADIUS_RATIO = 0.25
+    MAX_RADIUS_RATIO = 0.95
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setMinimumSize(200, 160)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+
+        self.phase_text = "lets get started"
+        self.background = QColor(245, 245, 245)
+        self.fill = QColor(102, 179, 255, 180)
+        self.outline = QColor(60, 130, 200)
+
+        self.radius_ratio = self.MIN_RADIUS_RATIO
+        self.animation = QVariantAnimation(self)
+        self.animation.setEasingCurve(QEasingCurve.InOutSine)
+        self.animation.valueChanged.connect(self.set_radius_ratio)
+
+        # Frame statistics
+        self.frame_clock = QElapsedTimer()
+        self.frame_count = 0
+        self.paint_ns_total = 0
+        self.paint_ns_max = 0
+
+    def circle_rect(self, ratio):
+        radius = min(self.width(), self.height()) / 2 * ratio
+        center = QPointF(self.width() / 2, self.height() / 2)
+        return QRectF(center.x() - radius, center.y() - radius, radius * 2, radius * 2)
+
+    def set_phase_text(self, text):
+        self.phase_text = text
+        self.update(self.text_rect())
+
+    def text_rect(self):
+        return self.rect().adjusted(0, self.height() // 2 - 20, 0, -(self.height() // 2 - 20))
+
+    def breathe_in(self, duration_ms):
+        self.animate_to(self.MAX_RADIUS_RATIO, duration_ms, "Breath In")
+
+    def breathe_out(self, duration_ms):
+        self.animate_to(self.MIN_RADIUS_RATIO, duration_ms, "Breath Out")
+
+    def animate_to(self, ratio, duration_ms, text):
+        """Animate from the current radius to ratio, ending exactly duration_ms from now."""
+        self.animation.stop()
+        self.set_phase_text(text)
+        if duration_ms <= 0:
+            self.set_radius_ratio(ratio)
+            return
+        self.animation.setStartValue(self.radius_ratio)
+        self.animation.setEndValue(float(ratio))
+        self.animation.setDuration(int(duration_ms))
+        self.animation.start()
+
+    def reset(self, text):
+        self.animation.stop()
+        self.set_radius_ratio(self.MIN_RADIUS_RATIO)
+        self.set_phase_text(text)
+
+    def set_radius_ratio(self, ratio):
+        dirty = self.circle_rect(self.radius_ratio).united(self.circle_rect(ratio))
+        self.radius_ratio = ratio
+        # Pad by two pixels so the antialiased outline is repainted too.
+        self.update(dirty.toAlignedRect().adjusted(-2, -2, 2, 2))
+
+    def paintEvent(self, event):
+        if not self.frame_clock.isValid():
+            self.frame_clock.start()
+        started = self.frame_clock.nsecsElapsed()
+
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), self.background)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(self.outline)
+        painter.setBrush(self.fill)
+        painter.drawEllipse(self.circle_rect(self.radius_ratio))
+
+        painter.setPen(QColor("#333333"))
+        painter.setFont(QFont("Arial", 16, QFont.Bold))
+        painter.drawText(self.rect(), Qt.AlignCenter, self.phase_text)
+        painter.end()
+
+        paint_ns = self.frame_clock.nsecsElapsed() - started
+        self.frame_count += 1
+        self.paint_ns_total += paint_ns
+        self.paint_ns_max = max(self.paint_ns_max, paint_ns)
+
+    def frame_stats(self):
+        """Frames painted and mean/max paint time in milliseconds."""
+        mean_ms = self.paint_ns_total / self.frame_count / 1e6 if self.frame_count else 0.0
+        return self.frame_count, mean_ms, self.paint_ns_max / 1e6
+
+
+if __name__ == "__main__":
+    # Offscreen benchmark: QT_QPA_PLATFORM=offscreen python breathing_circle.py [minutes]
+    import sys
+    import time
+    from PySide6.QtCore import QTimer
+
+    minutes = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    app = QApplication(sys.argv)
+    circle = BreathingCircle()
+    circle.resize(760, 200)
+    circle.show()
+
+    breath_ms = 5000
+    state = {"inhale": True}
+
+    def next_breath():
+        if state["inhale"]:
+            circle.breathe_in(breath_ms)
+        else:
+            circle.breathe_out(breath_ms)
+        state["inhale"] = not state["inhale"]
+
+    breath_timer = QTimer()
+    breath_timer.setTimerType(Qt.PreciseTimer)
+    breath_timer.timeout.connect(next_breath)
+    breath_timer.start(breath_ms)
+    next_breath()
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    QTimer.singleShot(int(minutes * 60 * 1000), app.quit)
+    app.exec()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    frames, mean_ms, max_ms = circle.frame_stats()
+    print(f"Run length:       {wall:.1f} s")
+    print(f"Frames painted:   {frames} ({frames / wall:.1f} fps)")
+    print(f"Paint time:       mean {mean_ms:.3f} ms, max {max_ms:.3f} ms")
+    print(f"CPU usage:        {cpu / wall * 100:.2f}% of one core")
@@ -0,0 +1,115 @@
+from PySide6.QtCore import QObject, QTimer, QElapsedTimer, Signal, Qt
+
+
+class BreathingPacer(QObject):
+    """Schedules breathing cues against absolute deadlines on a monotonic clock.
+
+    Every cue time is computed up front from the session start, and each timer
+    shot is armed for "deadline - now", so timer jitter never accumulates.
+    """
+
+    breath_in = Signal(int)   # breath-in duration in ms
+    breath_out = Signal(int)  # breath-out duration in ms
+    finished = Signal()       # session ran to its full length
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.clock = QElapsedTimer()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._on_deadline)
+
+        self.cues = []  # (deadline_ms, kind) sorted by deadline
+        self.next_cue = 0
+        self.breath_in_ms = 0
+        self.breath_out_ms = 0
+        self.total_ms = 0
+        self.max_lateness_ms = 0.0
+        self.total_lateness_ms = 0.0
+        self.fired_cues = 0
+
+    def start(self, breath_in_ms, breath_out_ms, total_ms):
+        """Start a new session; any previous session is cancelled."""
+        self.stop()
+        self.breath_in_ms = breath_in_ms
+        self.breath_out_ms = breath_out_ms
+        self.total_ms = total_ms
+
+        cycle_ms = breath_in_ms + breath_out_ms
+        self.cues = []
+        for cycle_start in range(0, total_ms, cycle_ms):
+            self.cues.append((cycle_start, "in"))
+            if cycle_start + breath_in_ms < total_ms:
+                self.cues.append((cycle_start + breath_in_ms, "out"))
+        self.cues.append((total_ms, "end"))
+
+        self.next_cue = 0
+        self.max_lateness_ms = 0.0
+        self.total_lateness_ms = 0.0
+        self.fired_cues = 0
+        self.clock.start()
+        self._arm()
+
+    def stop(self):
+        """Cancel the running session without emitting finished."""
+        self.timer.stop()
+        self.next_cue = len(self.cues)
+
+    def is_active(self):
+        return self.next_cue < len(self.cues)
+
+    def elapsed_ms(self):
+        """Milliseconds since the session started, from the monotonic clock."""
+        if not self.clock.isValid():
+            return 0.0
+        return self.clock.nsecsElapsed() / 1_000_000
+
+    def next_deadline_ms(self):
+        """Absolute deadline of the next cue, or None when idle."""
+        if not self.is_active():
+            return None
+        return self.cues[self.next_cue][0]
+
+    def cycles_completed(self):
+        """Number of full in+out cycles finished so far."""
+        cycle_ms = self.breath_in_ms + self.breath_out_ms
+        if cycle_ms <= 0:
+            return 0
+        return int(min(self.elapsed_ms(), self.total_ms) // cycle_ms)
+
+    def mean_lateness_ms(self):
+        return self.total_lateness_ms / self.fired_cues if self.fired_cues else 0.0
+
+    def _arm(self):
+        deadline = self.cues[self.next_cue][0]
+        remaining = deadline - self.elapsed_ms()
+        # QTimer has millisecond resolution; round up so we never fire early.
+        self.timer.start(max(0, int(remaining + 0.999)))
+
+    def _on_deadline(self):
+        if not self.is_active():
+            return
+
+        deadline, kind = self.cues[self.next_cue]
+        lateness = self.elapsed_ms() - deadline
+        if lateness < 0:
+            # Woke up early; re-arm against the same absolute deadline.
+            self._arm()
+            return
+
+        self.max_lateness_ms = max(self.max_lateness_ms, lateness)
+        self.total_lateness_ms += lateness
+        self.fired_cues += 1
+        self.next_cue += 1
+
+        if kind == "end":
+            self.timer.stop()
+            self.finished.emit()
+            return
+
+        self._arm()
+        if kind == "in":
+            self.breath_in.emit(self.breath_in_ms)
+        else:
+            self.breath_out.emit(self.breath_out_ms)
@@ -0,0 +1,165 @@
+import logging
+from PySide6.QtMultimedia import QAudioDecoder, QAudioFormat, QAudioSink, QAudio, QMediaDevices
+from PySide6.QtCore import QObject, QIODevice, QUrl, Signal
+
+log = logging.getLogger("wellhive.audio")
+
+
+class PcmSource(QIODevice):
+    """Read-only device over an already decoded PCM buffer, optionally looping."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pcm = b""
+        self.position = 0
+        self.loop = False
+
+    def load(self, pcm, loop=False):
+        self.pcm = pcm
+        self.position = 0
+        self.loop = loop
+        if not self.isOpen():
+            self.open(QIODevice.ReadOnly)
+
+    def readData(self, maxlen):
+        if not self.pcm:
+            return b""
+        if self.loop:
+            chunk = bytearray()
+            while len(chunk) < maxlen:
+                take = self.pcm[self.position:self.position + maxlen - len(chunk)]
+                chunk += take
+                self.position = (self.position + len(take)) % len(self.pcm)
+            return bytes(chunk)
+        chunk = self.pcm[self.position:self.position + maxlen]
+        self.position += len(chunk)
+        return chunk
+
+    def writeData(self, data):
+        return -1
+
+    def bytesAvailable(self):
+        if self.loop:
+            return len(self.pcm) + super().bytesAvailable()
+        return len(self.pcm) - self.position + super().bytesAvailable()
+
+    def isSequential(self):
+        return True
+
+
+class CueAudioEngine(QObject):
+    """Plays short cue sounds from PCM decoded once, through a small pool of audio sinks.
+
+    Each sound file is decoded a single time with QAudioDecoder. Playing a cue only
+    rewinds a PcmSource and starts an idle sink, so there is no decode or seek on
+    the hot path. One extra sink is reserved for an ambient loop.
+    """
+
+    SINK_BUFFER_US = 10_000  # 10 ms device buffer keeps cue latency low
+
+    load_failed = Signal(str, str)  # file path, decoder error
+
+    def __init__(self, voices=3, parent=None):
+        super().__init__(parent)
+        self.format = self.preferred_format()
+        self.sounds = {}    # cue name -> decoded PCM bytes
+        self.decoded = {}   # file path -> decoded PCM bytes, shared between cue names
+        self.pending = {}   # file path -> (decoder, bytearray, [cue names])
+
+        self.voices = [self.create_voice() for _ in range(voices)]
+        self.next_voice = 0
+        self.ambient = self.create_voice()
+
+    def preferred_format(self):
+        fmt = QMediaDevices.defaultAudioOutput().preferredFormat()
+        fmt.setSampleFormat(QAudioFormat.Int16)
+        return fmt
+
+    def create_voice(self):
+        sink = QAudioSink(QMediaDevices.defaultAudioOutput(), self.format, self)
+        sink.setBufferSize(self.format.bytesForDuration(self.SINK_BUFFER_US))
+        return sink, PcmSource(self)
+
+    def load(self, name, path):
+        """Decode the file at path (once) and register it under name."""
+        if path in self.decoded:
+            self.sounds[name] = self.decoded[path]
+            return
+        if path in self.pending:
+            self.pending[path][2].append(name)
+            return
+
+        decoder = QAudioDecoder(self)
+        decoder.setAudioFormat(self.format)
+        decoder.setSource(QUrl.fromLocalFile(path))
+        pcm = bytearray()
+        self.pending[path] = (decoder, pcm, [name])
+
+        decoder.bufferReady.connect(lambda: pcm.extend(bytes(decoder.read().constData())))
+        decoder.finished.connect(lambda: self.finish_decoding(path))
+        decoder.error.connect(lambda error: self.fail_decoding(path))
+        decoder.start()
+
+    def finish_decoding(self, path):
+        if path not in self.pending:
+            return  # already dropped by fail_decoding
+        decoder, pcm, names = self.pending.pop(path)
+        decoder.deleteLater()
+        self.decoded[path] = bytes(pcm)
+        for name in names:
+            self.sounds[name] = self.decoded[path]
+
+    def fail_decoding(self, path):
+        """Drop a file that could not be decoded; its cues stay silent."""
+        if path not in self.pending:
+            return
+        decoder, pcm, names = self.pending.pop(path)
+        decoder.deleteLater()
+        message = decoder.errorString()
+        log.warning("Failed to decode %s for %s: %s", path, ", ".join(names), message)
+        self.load_failed.emit(path, message)
+
+    def is_loaded(self, name):
+        return name in self.sounds
+
+    def play(self, name, volume=1.0):
+        """Play a cue on the first idle voice, stealing the oldest one if all are busy."""
+        pcm = self.sounds.get(name)
+        if pcm is None:
+            return
+
+        for offset in range(len(self.voices)):
+            index = (self.next_voice + offset) % len(self.voices)
+            if self.voices[index][0].state() != QAudio.ActiveState:
+                break
+        else:
+            index = self.next_voice
+        self.next_voice = (index + 1) % len(self.voices)
+
+        sink, source = self.voices[index]
+        sink.stop()
+        source.load(pcm)
+        sink.setVolume(volume)
+        sink.start(source)
+
+    def start_ambient(self, name, volume=0.3):
+        """Loop a decoded sound underneath the cues without another decoder."""
+        pcm = self.sounds.get(name)
+        if pcm is None:
+            return
+        sink, source = self.ambient
+        sink.stop()
+        source.load(pcm, loop=True)
+        sink.setVolume(volume)
+        sink.start(source)
+
+    def set_ambient_volume(self, volume):
+        self.ambient[0].setVolume(volume)
+
+    def stop_ambient(self):
+        self.ambient[0].stop()
+
+    def stop_all(self):
+        for sink, _ in self.voices:
+            sink.stop()
+        self.stop_ambient()
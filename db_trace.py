@@ -0,0 +1,293 @@
+import logging
+import math
+import os
+import re
+import threading
+import time
+import timeline
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton, QHeaderView
+from PySide6.QtCore import Qt, QTimer
+
+# Statements slower than this are written to the slow-query log
+SLOW_QUERY_MS = float(os.environ.get("WELLHIVE_SLOW_QUERY_MS", "100"))
+SLOW_QUERY_LOG = os.environ.get("WELLHIVE_SLOW_QUERY_LOG",
+                                os.path.join(os.path.dirname(os.path.abspath(__file__)), "slow_queries.log"))
+
+slow_query_log = logging.getLogger("wellhive.slow_queries")
+
+
+def setup_slow_query_log(path=SLOW_QUERY_LOG):
+    """Send slow statements to a file, once per process."""
+    if not slow_query_log.handlers:
+        handler = logging.FileHandler(path, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        slow_query_log.addHandler(handler)
+        slow_query_log.setLevel(logging.INFO)
+        slow_query_log.propagate = False
+
+
+LITERALS = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"|\b\d+(?:\.\d+)?\b|%s")
+VALUE_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+
+
+def fingerprint(statement):
+    """Normalise a statement so that calls differing only in values share a key."""
+    text = " ".join(statement.split())
+    text = LITERALS.sub("?", text)
+    text = VALUE_LISTS.sub("(...)", text)
+    return text[:200]
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram in the spirit of HdrHistogram.
+
+    Bucket i covers [base**(i - 1), base**i) microseconds with base = 1 + precision,
+    so any percentile is reported within that relative error using fixed memory.
+    """
+
+    def __init__(self, precision=0.02, max_us=600e6):
+        self.log_base = math.log1p(precision)
+        self.counts = [0] * (int(math.log(max_us) / self.log_base) + 2)
+        self.count = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+
+    def bucket(self, us):
+        if us < 1:
+            return 0
+        return min(int(math.log(us) / self.log_base) + 1, len(self.counts) - 1)
+
+    def record(self, us):
+        self.counts[self.bucket(us)] += 1
+        self.count += 1
+        self.total_us += us
+        self.max_us = max(self.max_us, us)
+
+    def merge(self, other):
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total_us += other.total_us
+        self.max_us = max(self.max_us, other.max_us)
+
+    def count_at_or_below(self, us):
+        """Samples no larger than us, to within the bucket precision."""
+        return sum(self.counts[:self.bucket(us) + 1])
+
+    def percentile(self, p):
+        """Upper bound of the bucket holding the p-th percentile, in microseconds."""
+        if not self.count:
+            return 0.0
+        target = max(math.ceil(p / 100 * self.count), 1)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(math.exp(index * self.log_base), self.max_us)
+        return self.max_us
+
+    def mean(self):
+        return self.total_us / self.count if self.count else 0.0
+
+
+class StatementStats:
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.rows = 0
+
+
+class QueryRegistry:
+    """Per-fingerprint latency histograms and row counts for this process.
+
+    The debug panel's Reset clears these; the exported totals in metrics.registry
+    are only ever added to, as Prometheus counters must be.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.statements = {}
+
+    def record(self, statement, elapsed_us, rows):
+        with self.lock:
+            stats = self.statements.get(statement)
+            if stats is None:
+                stats = self.statements[statement] = StatementStats()
+            stats.latency.record(elapsed_us)
+            stats.rows += max(rows, 0)
+        import metrics  # imported here: metrics itself imports this module
+        metrics.inc("wellhive_db_round_trips_total")
+        metrics.inc("wellhive_db_rows_total", max(rows, 0))
+        metrics.observe("wellhive_db_query_seconds", elapsed_us / 1e6)
+        if elapsed_us >= SLOW_QUERY_MS * 1000:
+            slow_query_log.info("%.1f ms, %d rows: %s", elapsed_us / 1000, max(rows, 0), statement)
+
+    def snapshot(self):
+        """(fingerprint, calls, rows, p50, p95, p99, max) rows, slowest p99 first."""
+        with self.lock:
+            rows = [
+                (statement, stats.latency.count, stats.rows,
+                 stats.latency.percentile(50), stats.latency.percentile(95),
+                 stats.latency.percentile(99), stats.latency.max_us)
+                for statement, stats in self.statements.items()
+            ]
+        return sorted(rows, key=lambda row: row[5], reverse=True)
+
+    def reset(self):
+        with self.lock:
+            self.statements.clear()
+
+
+registry = QueryRegistry()
+
+
+class TracedCursor:
+    """Cursor wrapper timing each statement from execute until its rows are fetched.
+
+    Time spent in fetch calls is added to the statement, since unbuffered
+    cursors stream rows from the server as they are read.
+    """
+
+    pending = None  # [fingerprint, elapsed_us, rows] of the statement being read
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def finish(self):
+        if self.pending is not None:
+            registry.record(*self.pending)
+            self.pending = None
+
+    def timed(self, method, *args):
+        started = time.perf_counter()
+        with timeline.span("db.fetch", "db"):
+            result = method(*args)
+        elapsed_us = (time.perf_counter() - started) * 1e6
+        return result, elapsed_us
+
+    def execute(self, operation, params=None, *args, **kwargs):
+        self.finish()
+        statement = fingerprint(operation)
+        started = time.perf_counter()
+        with timeline.span("db.execute", "db", statement=statement):
+            result = self.cursor.execute(operation, params, *args, **kwargs)
+        elapsed_us = (time.perf_counter() - started) * 1e6
+        rows = 0 if self.cursor.with_rows else self.cursor.rowcount
+        self.pending = [statement, elapsed_us, rows]
+        if not self.cursor.with_rows:
+            self.finish()
+        return result
+
+    def executemany(self, operation, seq_params):
+        self.finish()
+        statement = fingerprint(operation)
+        started = time.perf_counter()
+        with timeline.span("db.executemany", "db", statement=statement):
+            result = self.cursor.executemany(operation, seq_params)
+        elapsed_us = (time.perf_counter() - started) * 1e6
+        registry.record(statement, elapsed_us, self.cursor.rowcount)
+        return result
+
+    def fetchone(self):
+        row, elapsed_us = self.timed(self.cursor.fetchone)
+        if self.pending is not None:
+            self.pending[1] += elapsed_us
+            if row is None:
+                self.finish()
+            else:
+                self.pending[2] += 1
+        return row
+
+    def fetchmany(self, size=1):
+        rows, elapsed_us = self.timed(self.cursor.fetchmany, size)
+        if self.pending is not None:
+            self.pending[1] += elapsed_us
+            self.pending[2] += len(rows)
+            if len(rows) < size:
+                self.finish()
+        return rows
+
+    def fetchall(self):
+        rows, elapsed_us = self.timed(self.cursor.fetchall)
+        if self.pending is not None:
+            self.pending[1] += elapsed_us
+            self.pending[2] += len(rows)
+            self.finish()
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def close(self):
+        self.finish()
+        return self.cursor.close()
+
+    def __del__(self):
+        self.finish()
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+class TracedConnection:
+    """Connection wrapper whose cursors are traced; everything else is delegated."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        setup_slow_query_log()
+
+    def cursor(self, *args, **kwargs):
+        return TracedCursor(self.connection.cursor(*args, **kwargs))
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+def format_ms(us):
+    return f"{us / 1000:.2f}"
+
+
+class QueryStatsPanel(QWidget):
+    """Debug panel listing p50/p95/p99 latency per statement fingerprint."""
+
+    COLUMNS = ["Statement", "Calls", "Rows", "p50 ms", "p95 ms", "p99 ms", "Max ms"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("WellHive - Query Latency")
+        self.resize(900, 500)
+
+        layout = QVBoxLayout(self)
+
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        reset_button = QPushButton("Reset")
+        reset_button.clicked.connect(self.reset)
+        layout.addWidget(reset_button, alignment=Qt.AlignRight)
+
+        # Refresh while the panel is open
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(2000)
+        self.refresh()
+
+    def refresh(self):
+        if not self.isVisible() and self.table.rowCount():
+            return
+        rows = registry.snapshot()
+        self.table.setRowCount(len(rows))
+        for row, (statement, calls, total_rows, p50, p95, p99, max_us) in enumerate(rows):
+            values = [statement, str(calls), str(total_rows), format_ms(p50), format_ms(p95), format_ms(p99), format_ms(max_us)]
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                item.setToolTip(statement)
+                if column:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+    def reset(self):
+        registry.reset()
+        self.refresh()
@@ -0,0 +1,51 @@
+import numpy as np
+
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Keeps the first and last points and, from each of threshold - 2 equal
+    buckets in between, the point forming the largest triangle with the point
+    kept from the previous bucket and the mean of the next bucket. Peaks and
+    dips survive, while the output size depends only on threshold.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    # Bucket edges for the n - 2 interior points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    # Mean of each bucket, used as the third triangle vertex
+    counts = np.diff(edges)
+    cum_x = np.concatenate(([0.0], np.cumsum(x)))
+    cum_y = np.concatenate(([0.0], np.cumsum(y)))
+    mean_x = (cum_x[edges[1:]] - cum_x[edges[:-1]]) / counts
+    mean_y = (cum_y[edges[1:]] - cum_y[edges[:-1]]) / counts
+
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 1 < threshold - 2:
+            next_x, next_y = mean_x[bucket + 1], mean_y[bucket + 1]
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        ax, ay = x[previous], y[previous]
+        areas = np.abs((ax - next_x) * (y[start:end] - ay) - (ax - x[start:end]) * (next_y - ay))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+
+    return x[selected], y[selected]
+
+
+def downsample_dates(dates, values, threshold):
+    """LTTB over a date series; returns datetime64 dates and float values."""
+    days = np.array(dates, dtype="datetime64[D]")
+    x, y = lttb(days.astype(np.int64), values, threshold)
+    return x.astype(np.int64).astype("datetime64[D]"), y
@@ -0,0 +1,187 @@
+from datetime import date as Date, timedelta
+
+WATER_GOAL_LITRES = 2.0
+SLEEP_GOAL_HOURS = 7.0
+ROLLING_WINDOWS = (7, 30)
+
+ONE_DAY = timedelta(days=1)
+
+
+def to_date(day):
+    """Accept a date or a yyyy-MM-dd string; return None for anything unparseable."""
+    if isinstance(day, Date):
+        return day
+    try:
+        return Date.fromisoformat(str(day).strip())
+    except ValueError:
+        return None
+
+
+class StreakGoal:
+    """Running streak and rolling-average state for one tracker.
+
+    Days that meet the goal are kept as runs (start -> end and end -> start),
+    so recording a day only touches its neighbours. Rolling sums are kept for
+    windows ending today and adjusted by the delta of each change. Removing a
+    day from the middle of a run is the one case that walks the run to split it.
+    """
+
+    def __init__(self, name, target=None, unit=""):
+        self.name = name
+        self.target = target  # None means "any entry counts" (logging consistency)
+        self.unit = unit
+        self.loaded = False
+        self.reset(Date.today())
+
+    def reset(self, today):
+        self.today = today
+        self.values = {}     # date -> value
+        self.run_end = {}    # run start -> run end
+        self.run_start = {}  # run end -> run start
+        self.run_lengths = {}  # run length -> number of runs with that length
+        self.longest = 0
+        self.window_sums = {window: 0.0 for window in ROLLING_WINDOWS}
+        self.window_counts = {window: 0 for window in ROLLING_WINDOWS}
+        self.window_met = {window: 0 for window in ROLLING_WINDOWS}
+
+    def is_met(self, value):
+        if value is None:
+            return False
+        return self.target is None or value >= self.target
+
+    # Incremental updates
+
+    def record(self, day, value):
+        """Set (or with value=None, clear) the value for a day."""
+        day = to_date(day)
+        if day is None:
+            return
+        self.advance_to(Date.today())
+
+        old = self.values.pop(day, None)
+        if value is not None:
+            self.values[day] = value
+        self.adjust_windows(day, old, -1)
+        self.adjust_windows(day, value, +1)
+
+        was_met, now_met = self.is_met(old), self.is_met(value)
+        if now_met and not was_met:
+            self.add_met_day(day)
+        elif was_met and not now_met:
+            self.remove_met_day(day)
+
+    def remove(self, day):
+        self.record(day, None)
+
+    def adjust_windows(self, day, value, sign):
+        if value is None:
+            return
+        for window in ROLLING_WINDOWS:
+            if self.today - timedelta(days=window) < day <= self.today:
+                self.window_sums[window] += sign * value
+                self.window_counts[window] += sign
+                self.window_met[window] += sign * self.is_met(value)
+
+    def advance_to(self, today):
+        """Slide the rolling windows forward when the calendar day changes."""
+        while self.today < today:
+            self.today += ONE_DAY
+            for window in ROLLING_WINDOWS:
+                leaving = self.values.get(self.today - timedelta(days=window))
+                entering = self.values.get(self.today)
+                for value, sign in ((leaving, -1), (entering, +1)):
+                    if value is not None:
+                        self.window_sums[window] += sign * value
+                        self.window_counts[window] += sign
+                        self.window_met[window] += sign * self.is_met(value)
+
+    def add_run(self, start, end):
+        self.run_end[start] = end
+        self.run_start[end] = start
+        length = (end - start).days + 1
+        self.run_lengths[length] = self.run_lengths.get(length, 0) + 1
+        self.longest = max(self.longest, length)
+
+    def drop_run(self, start, end):
+        del self.run_end[start]
+        del self.run_start[end]
+        length = (end - start).days + 1
+        self.run_lengths[length] -= 1
+        if not self.run_lengths[length]:
+            del self.run_lengths[length]
+            if length == self.longest:
+                self.longest = max(self.run_lengths, default=0)
+
+    def add_met_day(self, day):
+        start = end = day
+        if day - ONE_DAY in self.run_start:
+            start = self.run_start[day - ONE_DAY]
+            self.drop_run(start, day - ONE_DAY)
+        if day + ONE_DAY in self.run_end:
+            end = self.run_end[day + ONE_DAY]
+            self.drop_run(day + ONE_DAY, end)
+        self.add_run(start, end)
+
+    def remove_met_day(self, day):
+        start = self.find_run_start(day)
+        end = self.run_end[start]
+        self.drop_run(start, end)
+        if start < day:
+            self.add_run(start, day - ONE_DAY)
+        if day < end:
+            self.add_run(day + ONE_DAY, end)
+
+    def find_run_start(self, day):
+        if day in self.run_start:
+            return self.run_start[day]
+        while day not in self.run_end:
+            day -= ONE_DAY
+        return day
+
+    # Queries
+
+    def current_streak(self):
+        """Length of the run ending today, or yesterday if today is not logged yet."""
+        self.advance_to(Date.today())
+        for anchor in (self.today, self.today - ONE_DAY):
+            if self.is_met(self.values.get(anchor)):
+                return (anchor - self.find_run_start(anchor)).days + 1
+        return 0
+
+    def rolling_average(self, window):
+        """Mean value over the logged days in the last window days."""
+        self.advance_to(Date.today())
+        count = self.window_counts[window]
+        return self.window_sums[window] / count if count else None
+
+    def rolling_rate(self, window):
+        """Fraction of the last window days on which the goal was met."""
+        self.advance_to(Date.today())
+        return self.window_met[window] / window
+
+    # Full recompute
+
+    def recompute(self, rows):
+        """Rebuild all state from (date, value) rows."""
+        self.reset(Date.today())
+        for day, value in rows:
+            self.record(day, value)
+        self.loaded = True
+
+    def recompute_from_db(self, db_conn, query):
+        cursor = db_conn.cursor()
+        cursor.execute(query)
+        self.recompute((day, float(value)) for day, value in cursor.fetchall())
+
+    def summary(self):
+        streak = f"Streak: {self.current_streak()} days (best {self.longest})"
+        if self.target is None:
+            rates = " / ".join(f"{self.rolling_rate(window):.0%}" for window in ROLLING_WINDOWS)
+            return f"{streak} | Logged last 7/30 days: {rates}"
+
+        averages = []
+        for window in ROLLING_WINDOWS:
+            average = self.rolling_average(window)
+            averages.append(f"{average:.1f}" if average is not None else "-")
+        return (f"Goal: {self.target:g} {self.unit} | {streak} | "
+                f"7/30-day average: {' / '.join(averages)} {self.unit}")
@@ -1,215 +1,207 @@
 import mysql.connector
+from db_trace import TracedConnection
+from stall_watchdog import watch
 from PySide6.QtWidgets import (
-    QApplication, QWidget, QLabel, QVBoxLayout, QPushButton, QTextEdit,
-    QCalendarWidget, QTabWidget, QFileDialog, QMessageBox
+    QApplication, QWidget, QLabel, QVBoxLayout, QPushButton, QTextEdit, QMessageBox, QLineEdit, QHBoxLayout
+)
+from PySide6.QtCore import Qt
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, Spacer, KeepTogether
+import re
+import html
+from pdf_stream import build_streamed_pdf
+from tracker_engine import MetricDefinition, TrackerWindow
+from image_cache import BACKGROUND, image_reader
+import profiling
+
+GRATITUDE = MetricDefinition(
+    "gratitude", "Gratitude Tracker", "gratitude_entries", "gratitude", value_type=str,
+    value_label="Gratitude", chart_kinds=(), editable=False, report_title="Gratitude Journal",
+    report_periods=("This Week", "This Month", "This Year", "All Entries"), pdf_background=BACKGROUND,
+    input_label="What are you grateful for today?", input_placeholder="Write down something you're grateful for...",
 )
-from PySide6.QtGui import QFont, QPalette, QBrush, QPixmap
-from PySide6.QtCore import Qt, QDate
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.utils import ImageReader
-import os
-
-
-class GratitudeTracker(QWidget):
-    def __init__(self, db_conn, background_path=None, parent=None):
-        super().__init__(parent)
-        self.db_conn = db_conn
-        self.setFixedSize(800, 600)
-        self.setWindowTitle("Gratitude Tracker")
-
-        # Main Layout
-        main_layout = QVBoxLayout(self)
-        self.tabs = QTabWidget()
-        main_layout.addWidget(self.tabs)
-
-        # Gratitude Tracker Tab
-        gratitude_tab = QWidget()
-        self.gratitude_layout(gratitude_tab, background_path)
-        self.tabs.addTab(gratitude_tab, "Gratitude Tracker")
-
-        # Report Tab
-        report_tab = QWidget()
-        self.report_layout(report_tab)
-        self.tabs.addTab(report_tab, "Report")
-
-    def gratitude_layout(self, tab, background_path):
-        """This layout is for the Gratitude Tracker tab."""
-        layout = QVBoxLayout(tab)
 
-        # Set background
-        if background_path:
-            self.set_background(tab, background_path)
-
-        # Title
-        title = QLabel("Gratitude Tracker")
-        title.setFont(QFont("Arial", 18, QFont.Bold))
-        title.setAlignment(Qt.AlignCenter)
-        layout.addWidget(title)
-
-        # Calendar
-        self.calendar = QCalendarWidget()
-        self.calendar.setGridVisible(False)
-        self.calendar.setVerticalHeaderFormat(QCalendarWidget.NoVerticalHeader)
-        self.calendar.setSelectedDate(QDate.currentDate())  # Set to current date
-        self.calendar.clicked.connect(self.load_day_data)
-        layout.addWidget(self.calendar)
-
-        # Gratitude Section
-        gratitude_layout = QVBoxLayout()
-        gratitude_label = QLabel("What are you grateful for today?")
-        gratitude_label.setFont(QFont("Arial", 12))
-        self.gratitude_edit = QTextEdit()
-        self.gratitude_edit.setPlaceholderText("Write down something you're grateful for...")
-        gratitude_layout.addWidget(gratitude_label)
-        gratitude_layout.addWidget(self.gratitude_edit)
-        layout.addLayout(gratitude_layout)
-
-        # Save Button
-        save_button = QPushButton("Save Entry")
-        save_button.setStyleSheet(""" 
-            QPushButton {
-                background-color: #4CAF50;
-                color: white;
-                font-size: 14px;
-                padding: 10px;
-                border-radius: 5px;
-            }
-            QPushButton:hover {
-                background-color: #45A049;
-            }
-        """)
-        save_button.clicked.connect(self.save_entry)
-        layout.addWidget(save_button, alignment=Qt.AlignCenter)
-
-    def report_layout(self, tab):
-        """This layout is for the Report tab."""
-        layout = QVBoxLayout(tab)
 
-        self.report_box = QTextEdit(self)
-        self.report_box.setPlaceholderText("Report will be displayed here...")
-        self.report_box.setReadOnly(True)
-        layout.addWidget(self.report_box)
-
-        # Generate Report Button
-        generate_button = QPushButton("Generate Report")
-        generate_button.clicked.connect(self.generate_report)
-        layout.addWidget(generate_button, alignment=Qt.AlignCenter)
-
-        # Download Report Button
-        pdf_button = QPushButton("Download Report as PDF with Image")
-        pdf_button.clicked.connect(self.download_report_pdf_with_image)
-        layout.addWidget(pdf_button, alignment=Qt.AlignCenter)
-
-    def set_background(self, widget, background_path):
-        """Set the custom background."""
-        palette = QPalette()
-        pixmap = QPixmap(background_path)
-        if not pixmap.isNull():
-            palette.setBrush(QPalette.Window, QBrush(pixmap))
-        widget.setAutoFillBackground(True)
-        widget.setPalette(palette)
-
-    def load_day_data(self, date):
-        """Load data for the selected day."""
-        try:
-            selected_date = date.toString("yyyy-MM-dd")
-            cursor = self.db_conn.cursor()
-            query = "SELECT gratitude FROM gratitude_entries WHERE date = %s"
-            cursor.execute(query, (selected_date,))
-            result = cursor.fetchone()
-
-            if result:
-                gratitude = result[0]
-                self.gratitude_edit.setPlainText(gratitude)
-            else:
-                self.gratitude_edit.clear()
-        except mysql.connector.Error as e:
-            QMessageBox.critical(self, "Error", f"Failed to load data: {e}")
+def highlight_html(text, pattern):
+    """Escape text for rich text, marking each match of pattern.
 
-    def save_entry(self):
-        """Save the current gratitude entry into the database."""
-        try:
-            date = self.calendar.selectedDate().toString("yyyy-MM-dd")
-            gratitude = self.gratitude_edit.toPlainText()
+    Matching runs on the raw text and each piece is escaped separately, so a
+    search can never match inside an entity such as &quot;.
+    """
+    parts = []
+    last = 0
+    for match in pattern.finditer(text):
+        parts.append(html.escape(text[last:match.start()]))
+        parts.append(f'<span style="background-color: #ffff99;"><b>{html.escape(match.group(0))}</b></span>')
+        last = match.end()
+    parts.append(html.escape(text[last:]))
+    return "".join(parts)
 
-            cursor = self.db_conn.cursor()
-            query = "REPLACE INTO gratitude_entries (date, gratitude) VALUES (%s, %s)"
-            cursor.execute(query, (date, gratitude))
-            self.db_conn.commit()
-
-            QMessageBox.information(self, "Success", f"Entry saved for {date}.")
-        except mysql.connector.Error as e:
-            QMessageBox.critical(self, "Error", f"Failed to save entry: {e}")
 
-    def generate_report(self):
-        """Generate a textual report."""
-        try:
-            cursor = self.db_conn.cursor()
-            end_date = QDate.currentDate().toString("yyyy-MM-dd")
-            start_date = QDate.currentDate().addDays(-7).toString("yyyy-MM-dd")
+class GratitudeTracker(TrackerWindow):
+    SEARCH_PAGE_SIZE = 20
+    definition = GRATITUDE
 
-            query = """
-                SELECT date, gratitude
-                FROM gratitude_entries
-                WHERE date BETWEEN %s AND %s;
-            """
-            cursor.execute(query, (start_date, end_date))
-            results = cursor.fetchall()
+    def __init__(self, db_conn, background_path=None, parent=None, anomaly_detector=None):
+        super().__init__(db_conn, background_path, parent, anomaly_detector)
 
-            report = f"Report from {start_date} to {end_date}:\n\n"
-            for row in results:
-                date, gratitude = row
-                report += f"Date: {date}\nGratitude: {gratitude}\n\n"
+        # Search Tab
+        search_tab = QWidget()
+        self.search_layout(search_tab)
+        self.tabs.addTab(search_tab, "Search")
 
-            self.report_box.setPlainText(report)
-        except mysql.connector.Error as e:
-            QMessageBox.critical(self, "Error", f"Failed to generate report: {e}")
+    def search_layout(self, tab):
+        """This layout is for the Search tab."""
+        layout = QVBoxLayout(tab)
 
-    def download_report_pdf_with_image(self):
-        """Download the gratitude report as a PDF with a background image."""
+        # Search Box
+        search_bar = QHBoxLayout()
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search your gratitude entries...")
+        self.search_input.returnPressed.connect(self.search_entries)
+        search_bar.addWidget(self.search_input)
+
+        search_button = QPushButton("Search")
+        search_button.clicked.connect(self.search_entries)
+        search_bar.addWidget(search_button)
+        layout.addLayout(search_bar)
+
+        self.search_results = QTextEdit(self)
+        self.search_results.setPlaceholderText("Search results will be displayed here...")
+        self.search_results.setReadOnly(True)
+        layout.addWidget(self.search_results)
+
+        # Paging
+        paging_layout = QHBoxLayout()
+        self.prev_page_button = QPushButton("Previous")
+        self.prev_page_button.clicked.connect(lambda: self.show_search_page(self.search_page - 1))
+        self.prev_page_button.setEnabled(False)
+        paging_layout.addWidget(self.prev_page_button)
+
+        self.page_label = QLabel("")
+        self.page_label.setAlignment(Qt.AlignCenter)
+        paging_layout.addWidget(self.page_label)
+
+        self.next_page_button = QPushButton("Next")
+        self.next_page_button.clicked.connect(lambda: self.show_search_page(self.search_page + 1))
+        self.next_page_button.setEnabled(False)
+        paging_layout.addWidget(self.next_page_button)
+        layout.addLayout(paging_layout)
+
+        self.search_terms = []
+        self.search_page = 0
+
+    def report_line(self, row):
+        date, gratitude = row
+        return f"Date: {date}\nGratitude: {gratitude}\n"
+
+    @profiling.action("search")
+    def search_entries(self):
+        """Start a new search from the text in the search box."""
+        # Keep plain words only, so user input cannot inject boolean-mode operators
+        self.search_terms = re.findall(r"\w+", self.search_input.text().lower())
+        if not self.search_terms:
+            QMessageBox.warning(self, "Input Error", "Please enter a word to search for.")
+            return
+        self.show_search_page(0)
+
+    def show_search_page(self, page):
+        """Fetch one page of ranked matches from the FULLTEXT index."""
+        if page < 0 or not self.search_terms:
+            return
         try:
-            file_path, _ = QFileDialog.getSaveFileName(self, "Save Report", "Gratitude_Report.pdf", "PDF Files (*.pdf)")
-            if not file_path:
-                return
-
+            # Every word must appear, as a word or word prefix
+            against = " ".join(f"+{term}*" for term in self.search_terms)
             cursor = self.db_conn.cursor()
-            end_date = QDate.currentDate().toString("yyyy-MM-dd")
-            start_date = QDate.currentDate().addDays(-7).toString("yyyy-MM-dd")
-
             query = """
-                SELECT date, gratitude
+                SELECT date, gratitude, MATCH(gratitude) AGAINST (%s IN BOOLEAN MODE) AS score
                 FROM gratitude_entries
-                WHERE date BETWEEN %s AND %s;
+                WHERE MATCH(gratitude) AGAINST (%s IN BOOLEAN MODE)
+                ORDER BY score DESC, date DESC
+                LIMIT %s OFFSET %s
             """
-            cursor.execute(query, (start_date, end_date))
+            # Fetch one extra row to know whether a next page exists
+            cursor.execute(query, (against, against, self.SEARCH_PAGE_SIZE + 1, page * self.SEARCH_PAGE_SIZE))
             results = cursor.fetchall()
+        except mysql.connector.Error as e:
+            QMessageBox.critical(self, "Error", f"Failed to search entries: {e}")
+            return
+
+        self.search_page = page
+        has_next = len(results) > self.SEARCH_PAGE_SIZE
+        results = results[:self.SEARCH_PAGE_SIZE]
+
+        if not results and page == 0:
+            self.search_results.setPlainText("No entries match your search.")
+        else:
+            highlight = re.compile(r"\b(" + "|".join(re.escape(term) for term in self.search_terms) + r")\w*", re.IGNORECASE)
+            entries = []
+            for date, gratitude, score in results:
+                entries.append(f"<p><b>{date}</b><br>{highlight_html(gratitude or '', highlight)}</p>")
+            self.search_results.setHtml("".join(entries))
+
+        self.page_label.setText(f"Page {page + 1}")
+        self.prev_page_button.setEnabled(page > 0)
+        self.next_page_button.setEnabled(has_next)
+
+    def write_pdf(self, file_path, start_date, end_date, title):
+        """Stream the entries into the PDF instead of drawing them on a canvas."""
+        flowables = self.report_flowables(start_date, end_date, title)
+        build_streamed_pdf(file_path, flowables, image_reader(self.definition.pdf_background))
+
+    def report_flowables(self, start_date, end_date, title, batch_size=500):
+        """Yield the report's flowables while streaming rows from the database in batches."""
+        styles = getSampleStyleSheet()
+        yield Paragraph(html.escape(title), styles["Title"])
+
+        # A dedicated cursor keeps the result set streaming while pages are laid out
+        cursor = self.db_conn.cursor()
+        query = """
+            SELECT date, gratitude
+            FROM gratitude_entries
+            WHERE date BETWEEN %s AND %s
+            ORDER BY date;
+        """
+        cursor.execute(query, (start_date, end_date))
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for date, gratitude in rows:
+                    text = html.escape(gratitude or "").replace("\n", "<br/>")
+                    yield KeepTogether([
+                        Paragraph(f"<b>{date}</b>", styles["Heading4"]),
+                        Paragraph(text, styles["BodyText"]),
+                        Spacer(1, 8),
+                    ])
+        finally:
+            # Drain anything left unread (e.g. after a layout error) so the connection stays usable
+            while cursor.fetchmany(batch_size):
+                pass
+            cursor.close()
+
+
+def create_tables(db_conn):
+    """Create the gratitude table and its FULLTEXT index."""
+    cursor = db_conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS gratitude_entries (
+            date DATE PRIMARY KEY,
+            gratitude TEXT,
+            FULLTEXT INDEX gratitude_text (gratitude)
+        );
+    """)
+    # Tables created before search existed need the index added
+    cursor.execute("""
+        SELECT COUNT(*)
+        FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = 'gratitude_entries' AND index_name = 'gratitude_text'
+    """)
+    if not cursor.fetchone()[0]:
+        cursor.execute("ALTER TABLE gratitude_entries ADD FULLTEXT INDEX gratitude_text (gratitude)")
+    db_conn.commit()
 
-            pdf = canvas.Canvas(file_path, pagesize=letter)
-            width, height = letter
-
-            image_path = r"C:\kio\145\hji.png"  # Add your image path for the PDF background
-            if os.path.exists(image_path):
-                background = ImageReader(image_path)
-                pdf.drawImage(background, 0, 0, width=width, height=height, mask='auto')
-
-            pdf.setFont("Helvetica-Bold", 14)
-            pdf.drawString(50, height - 50, f"Report from {start_date} to {end_date}")
-
-            y = height - 100
-            pdf.setFont("Helvetica", 12)
-            for row in results:
-                date, gratitude = row
-                pdf.drawString(50, y, f"Date: {date} | Gratitude: {gratitude}")
-                y -= 20
-                if y < 50:
-                    pdf.showPage()
-                    y = height - 50
-
-            pdf.save()
-            QMessageBox.information(self, "Success", "Report saved successfully as PDF.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save PDF: {e}")
 
 # Main Entry
 if __name__ == "__main__":
@@ -219,27 +211,20 @@ if __name__ == "__main__":
 
     # Database connection
     try:
-        db_conn = mysql.connector.connect(
+        db_conn = TracedConnection(mysql.connector.connect(
             host="localhost",
             user="root",
             password="1234",  # Update your MySQL root password
             database="wellhive"
-        )
-        cursor = db_conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS gratitude_entries (
-                date DATE PRIMARY KEY,
-                gratitude TEXT
-            );
-        """)
-        db_conn.commit()
+        ))
+        create_tables(db_conn)
     except mysql.connector.Error as e:
         QMessageBox.critical(None, "Database Error", f"Failed to connect to database: {e}")
         sys.exit(1)
 
     # Load the app
-    background_path = r"C:\kio\145\hji.png"  # Update to your background image path
-    window = GratitudeTracker(db_conn, background_path)
+    window = GratitudeTracker(db_conn, BACKGROUND)
     window.show()
+    watch(window, "Gratitude")
 
     sys.exit(app.exec())
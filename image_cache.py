@@ -0,0 +1,92 @@
+import io
+import os
+from PySide6.QtCore import Qt, QFile, QIODevice
+from PySide6.QtGui import QPixmap, QIcon
+from reportlab.lib.utils import ImageReader
+import metrics
+
+try:
+    import assets_rc  # compiled bundle: pyside6-rcc assets.qrc -o assets_rc.py
+except ImportError:
+    assets_rc = None
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+# Asset names, relative to assets/ and to the :/assets resource prefix
+LOGO = "logo.png"
+BACKGROUND = "background.png"
+BACK_ICON = "icons/back.png"
+START_ICON = "icons/start.png"
+
+
+def asset_path(name):
+    """Where Qt finds an asset: in the compiled bundle if present, else under assets/.
+
+    Absolute paths and resource paths are returned unchanged, so callers may
+    still pass an image of their own.
+    """
+    if os.path.isabs(name) or name.startswith(":"):
+        return name
+    if assets_rc is not None:
+        return f":/assets/{name}"
+    return os.path.join(ASSET_DIR, name)
+
+
+class ImageCache:
+    """Images decoded once per process and shared by every window.
+
+    Scaled variants are kept per (size, aspect mode), so six buttons showing
+    the same 50x50 logo share a single scaled pixmap, and a repaint at an
+    unchanged size does no scaling at all.
+    """
+
+    def __init__(self):
+        self.originals = {}  # name -> QPixmap
+        self.scaled = {}     # (name, width, height, aspect mode) -> QPixmap
+        self.icons = {}      # name -> QIcon
+        self.data = {}       # name -> encoded bytes, for reportlab
+
+    def pixmap(self, name, size=None, mode=Qt.KeepAspectRatio):
+        """The decoded image, or a smooth-scaled copy when size is (width, height)."""
+        original = self.originals.get(name)
+        metrics.inc("wellhive_cache_requests_total", cache="images", result="miss" if original is None else "hit")
+        if original is None:
+            original = self.originals[name] = QPixmap(asset_path(name))
+        if size is None or original.isNull():
+            return original
+
+        key = (name, size[0], size[1], mode)
+        scaled = self.scaled.get(key)
+        if scaled is None:
+            scaled = self.scaled[key] = original.scaled(size[0], size[1], mode, Qt.SmoothTransformation)
+        return scaled
+
+    def icon(self, name):
+        icon = self.icons.get(name)
+        if icon is None:
+            icon = self.icons[name] = QIcon(self.pixmap(name))
+        return icon
+
+    def image_reader(self, name):
+        """A reportlab ImageReader over the encoded asset, or None if it is missing."""
+        if name not in self.data:
+            asset = QFile(asset_path(name))
+            self.data[name] = bytes(asset.readAll()) if asset.open(QIODevice.ReadOnly) else None
+            asset.close()
+        data = self.data[name]
+        return ImageReader(io.BytesIO(data)) if data else None
+
+
+images = ImageCache()
+
+
+def pixmap(name, size=None, mode=Qt.KeepAspectRatio):
+    return images.pixmap(name, size, mode)
+
+
+def icon(name):
+    return images.icon(name)
+
+
+def image_reader(name):
+    return images.image_reader(name)
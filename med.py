@@ -1,35 +1,101 @@
-from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
-from PySide6.QtCore import QUrl, QTimer
+import mysql.connector
+from db_trace import TracedConnection
+from stall_watchdog import watch
+from datetime import date as Date, timedelta
+from PySide6.QtCore import QTimer, QDateTime
 from PySide6.QtWidgets import (QApplication, QWidget, QLabel, QVBoxLayout, QPushButton,
-                               QSpinBox, QHBoxLayout, QSlider)
-from PySide6.QtGui import QFont, QIcon
+                               QSpinBox, QHBoxLayout, QSlider, QMessageBox)
+from PySide6.QtGui import QFont
 from PySide6.QtCore import Qt
-from PySide6.QtCore import QUrl
+from cue_audio import CueAudioEngine
+from breathing_circle import BreathingCircle
+from breathing_pacer import BreathingPacer
+import image_cache
+import metrics
+import profiling
+
+class MeditationStats:
+    """Streaks and weekly totals, folded in from sessions newer than the last one seen.
+
+    Opening the statistics view only fetches rows with an id above
+    last_session_id, so history is scanned once per process, not once per view.
+    """
+
+    def __init__(self):
+        self.last_session_id = 0
+        self.total_sessions = 0
+        self.daily_minutes = {}   # date -> minutes meditated
+        self.weekly_minutes = {}  # (iso year, iso week) -> minutes meditated
+        self.last_day = None
+        self.run_length = 0
+        self.longest_streak = 0
+
+    def refresh(self, db_conn):
+        cursor = db_conn.cursor()
+        query = """
+            SELECT id, DATE(started_at), TIMESTAMPDIFF(SECOND, started_at, ended_at)
+            FROM meditation_sessions
+            WHERE id > %s
+            ORDER BY id
+        """
+        cursor.execute(query, (self.last_session_id,))
+        for session_id, day, seconds in cursor.fetchall():
+            self.add_session(day, seconds / 60)
+            self.last_session_id = session_id
+
+    def add_session(self, day, minutes):
+        self.total_sessions += 1
+        self.daily_minutes[day] = self.daily_minutes.get(day, 0) + minutes
+        week = tuple(day.isocalendar())[:2]
+        self.weekly_minutes[week] = self.weekly_minutes.get(week, 0) + minutes
+
+        # Sessions arrive in id order, which is chronological in practice.
+        if self.last_day is None or day > self.last_day + timedelta(days=1):
+            self.run_length = 1
+        elif day == self.last_day + timedelta(days=1):
+            self.run_length += 1
+        if self.last_day is None or day > self.last_day:
+            self.last_day = day
+        self.longest_streak = max(self.longest_streak, self.run_length)
+
+    def current_streak(self, today=None):
+        """The run ending today, or yesterday if today has no session yet."""
+        today = today or Date.today()
+        if self.last_day is None or self.last_day < today - timedelta(days=1):
+            return 0
+        return self.run_length
+
 
 class MeditationExercise(QWidget):
-    def __init__(self, parent=None):
+    SESSION_BATCH_SIZE = 5
+    SESSION_FLUSH_MS = 2000  # queued sessions are written this long after the last one ends
+
+    def __init__(self, db_conn=None, parent=None):
         super().__init__(parent)
+        self.db_conn = db_conn
+        self.pending_sessions = []  # session rows waiting for the next batched insert
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setSingleShot(True)
+        self.flush_timer.setInterval(self.SESSION_FLUSH_MS)
+        self.flush_timer.timeout.connect(self.flush_sessions)
+        self.session_started_at = None
+        self.stats = MeditationStats()
         self.setFixedSize(800, 500)
         self.setWindowTitle("Meditation Exercise")
 
-        # Initialize sound players
-        self.breath_in_player = QMediaPlayer()
-        self.breath_out_player = QMediaPlayer()
-
-        self.audio_output_in = QAudioOutput()
-        self.audio_output_out = QAudioOutput()
-
-        self.breath_in_player.setAudioOutput(self.audio_output_in)
-        self.breath_out_player.setAudioOutput(self.audio_output_out)
+        # Cue sounds are decoded once and played from memory
+        self.audio = CueAudioEngine(voices=3, parent=self)
 
         # Paths to sound files (update paths accordingly)
-        self.breath_in_sound = QUrl.fromLocalFile(r"C:\kio\145\sakisound.mp3")
-        self.breath_out_sound = QUrl.fromLocalFile(r"C:\kio\145\sakisound.mp3")
-        self.breath_in_player.setSource(self.breath_in_sound)
-        self.breath_out_player.setSource(self.breath_out_sound)
+        self.breath_in_sound = r"C:\kio\145\sakisound.mp3"
+        self.breath_out_sound = r"C:\kio\145\sakisound.mp3"
+        self.audio.load("breath_in", self.breath_in_sound)
+        self.audio.load("breath_out", self.breath_out_sound)
 
-        self.sound_timer = QTimer()
-        self.sound_timer.timeout.connect(self.play_breathing_cycle)
+        self.pacer = BreathingPacer(self)
+        self.pacer.breath_in.connect(self.play_breathing_cycle)
+        self.pacer.breath_out.connect(self.play_breath_out_sound)
+        self.pacer.finished.connect(self.stop_breathing_session)
 
         # Main Layout
         main_layout = QVBoxLayout(self)
@@ -43,7 +109,7 @@ class MeditationExercise(QWidget):
 
         # Back Button
         back_button = QPushButton("Back")
-        back_button.setIcon(QIcon("icons/back.png"))
+        back_button.setIcon(image_cache.icon(image_cache.BACK_ICON))
         back_button.setFont(QFont("Arial", 16))
         back_button.clicked.connect(self.close)  # Close the widget
         main_layout.addWidget(back_button, alignment=Qt.AlignLeft)
@@ -87,13 +153,11 @@ class MeditationExercise(QWidget):
         self.volume_in_slider = QSlider(Qt.Horizontal)
         self.volume_in_slider.setRange(0, 100)
         self.volume_in_slider.setValue(50)
-        self.volume_in_slider.valueChanged.connect(lambda: self.audio_output_in.setVolume(self.volume_in_slider.value() / 100))
 
         volume_out_label = QLabel("Breath Out Volume:")
         self.volume_out_slider = QSlider(Qt.Horizontal)
         self.volume_out_slider.setRange(0, 100)
         self.volume_out_slider.setValue(50)
-        self.volume_out_slider.valueChanged.connect(lambda: self.audio_output_out.setVolume(self.volume_out_slider.value() / 100))
 
         volume_layout.addWidget(volume_in_label)
         volume_layout.addWidget(self.volume_in_slider)
@@ -104,49 +168,174 @@ class MeditationExercise(QWidget):
 
         # Start/Stop Exercise Button
         self.start_button = QPushButton("Start Exercise")
-        self.start_button.setIcon(QIcon("icons/start.png"))
+        self.start_button.setIcon(image_cache.icon(image_cache.START_ICON))
         self.start_button.clicked.connect(self.start_breathing_session)
         main_layout.addWidget(self.start_button, alignment=Qt.AlignCenter)
 
-        # Breathing Animation Placeholder
-        self.animation_label = QLabel("lets get started")
-        self.animation_label.setAlignment(Qt.AlignCenter)
-        self.animation_label.setFont(QFont("Arial", 16, QFont.Bold))
-        self.animation_label.setStyleSheet("border: 2px solid gray; padding: 20px;")
-        main_layout.addWidget(self.animation_label)
+        # Statistics Button
+        stats_button = QPushButton("View Statistics")
+        stats_button.clicked.connect(self.show_statistics)
+        main_layout.addWidget(stats_button, alignment=Qt.AlignCenter)
+
+        # Breathing Animation
+        self.breathing_circle = BreathingCircle()
+        main_layout.addWidget(self.breathing_circle, stretch=1)
 
     def start_breathing_session(self):
         duration = self.duration_spinbox.value() * 60 * 1000  # Convert minutes to milliseconds
-        self.sound_timer.start((self.breath_in_duration.value() + self.breath_out_duration.value()) * 1000)
-        QTimer.singleShot(duration, self.stop_breathing_session)
-        self.animation_label.setText("Exercise Started")
+        self.pacer.start(self.breath_in_duration.value() * 1000, self.breath_out_duration.value() * 1000, duration)
+        self.session_started_at = QDateTime.currentDateTime()
+        self.breathing_circle.reset("Exercise Started")
         self.start_button.setText("Stop Exercise")
         self.start_button.clicked.disconnect()
         self.start_button.clicked.connect(self.stop_breathing_session)
 
     def stop_breathing_session(self):
-        self.sound_timer.stop()
-        self.animation_label.setText("Exercise Ended")
+        if self.session_started_at is not None:
+            self.log_session(interrupted=self.pacer.is_active())
+        self.pacer.stop()
+        self.audio.stop_all()
+        self.breathing_circle.reset("Exercise Ended")
         self.start_button.setText("Start Exercise")
         self.start_button.clicked.disconnect()
         self.start_button.clicked.connect(self.start_breathing_session)
 
-    def play_breathing_cycle(self):
-        self.audio_output_in.setVolume(self.volume_in_slider.value() / 100)
-        self.breath_in_player.play()
-        self.animation_label.setText("Breath In")
-        QTimer.singleShot(self.breath_in_duration.value() * 1000, self.play_breath_out_sound)
+    def log_session(self, interrupted):
+        """Queue the finished session; rows are written in batches, or shortly after the last session."""
+        self.pending_sessions.append((
+            self.session_started_at.toString("yyyy-MM-dd HH:mm:ss"),
+            QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss"),
+            self.pacer.breath_in_ms // 1000,
+            self.pacer.breath_out_ms // 1000,
+            self.pacer.total_ms // 60000,
+            self.pacer.cycles_completed(),
+            interrupted,
+        ))
+        self.session_started_at = None
+        if len(self.pending_sessions) >= self.SESSION_BATCH_SIZE:
+            self.flush_sessions()
+        else:
+            self.flush_timer.start()
+
+    @profiling.action("save")
+    def flush_sessions(self):
+        """Write all queued sessions with a single executemany."""
+        self.flush_timer.stop()
+        if not self.db_conn or not self.pending_sessions:
+            return
+        try:
+            cursor = self.db_conn.cursor()
+            query = """
+                INSERT INTO meditation_sessions
+                    (started_at, ended_at, breath_in_seconds, breath_out_seconds,
+                     planned_minutes, cycles_completed, interrupted)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """
+            cursor.executemany(query, self.pending_sessions)
+            self.db_conn.commit()
+            self.pending_sessions = []
+        except mysql.connector.Error as e:
+            QMessageBox.critical(self, "Error", f"Failed to save sessions: {e}")
 
-    def play_breath_out_sound(self):
-        self.audio_output_out.setVolume(self.volume_out_slider.value() / 100)
-        self.breath_out_player.play()
-        self.animation_label.setText("Breath Out")
+    @profiling.action("statistics")
+    @metrics.timed("wellhive_chart_render_seconds", tracker="meditation")
+    def show_statistics(self):
+        if not self.db_conn:
+            QMessageBox.warning(self, "No Database", "Sessions are not being saved, so there are no statistics.")
+            return
+        try:
+            self.flush_sessions()
+            self.stats.refresh(self.db_conn)
+        except mysql.connector.Error as e:
+            QMessageBox.critical(self, "Error", f"Failed to load statistics: {e}")
+            return
+
+        if not self.stats.total_sessions:
+            QMessageBox.information(self, "No Data", "No meditation sessions recorded yet.")
+            return
+
+        report = f"Sessions: {self.stats.total_sessions}\n"
+        report += f"Current streak: {self.stats.current_streak()} days\n"
+        report += f"Longest streak: {self.stats.longest_streak} days\n\n"
+        report += "Weekly totals (last 8 weeks):\n"
+        today = Date.today()
+        for weeks_back in range(8):
+            year, week = tuple((today - timedelta(weeks=weeks_back)).isocalendar())[:2]
+            minutes = self.stats.weekly_minutes.get((year, week), 0)
+            report += f"{year}-W{week:02d}: {minutes:.0f} min\n"
+
+        if hasattr(self, "stats_window") and self.stats_window is not None:
+            self.stats_window.close()
+
+        self.stats_window = QWidget()
+        self.stats_window.setWindowTitle("Meditation Statistics")
+        self.stats_window.setFixedSize(400, 350)
+        layout = QVBoxLayout(self.stats_window)
+        stats_label = QLabel(report)
+        stats_label.setFont(QFont("Arial", 12))
+        layout.addWidget(stats_label)
+        self.stats_window.show()
+
+    def closeEvent(self, event):
+        if self.session_started_at is not None:
+            self.stop_breathing_session()
+        self.flush_sessions()
+        super().closeEvent(event)
+
+    def play_breathing_cycle(self, duration_ms=None):
+        self.audio.play("breath_in", self.volume_in_slider.value() / 100)
+        self.breathing_circle.breathe_in(self.phase_remaining_ms())
+
+    def play_breath_out_sound(self, duration_ms=None):
+        self.audio.play("breath_out", self.volume_out_slider.value() / 100)
+        self.breathing_circle.breathe_out(self.phase_remaining_ms())
+
+    def phase_remaining_ms(self):
+        """Time left until the pacer's next deadline, i.e. the end of the current phase."""
+        deadline = self.pacer.next_deadline_ms()
+        if deadline is None:
+            return 0
+        return deadline - self.pacer.elapsed_ms()
+
+
+def create_tables(db_conn):
+    """Create the meditation_sessions table."""
+    cursor = db_conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS meditation_sessions (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            started_at DATETIME NOT NULL,
+            ended_at DATETIME NOT NULL,
+            breath_in_seconds TINYINT UNSIGNED NOT NULL,
+            breath_out_seconds TINYINT UNSIGNED NOT NULL,
+            planned_minutes SMALLINT UNSIGNED NOT NULL,
+            cycles_completed INT UNSIGNED NOT NULL,
+            interrupted BOOLEAN NOT NULL,
+            INDEX (started_at)
+        );
+    """)
+    db_conn.commit()
 
 
 if __name__ == "__main__":
     import sys
 
     app = QApplication(sys.argv)
-    exercise = MeditationExercise()
+
+    # Database connection
+    try:
+        db_conn = TracedConnection(mysql.connector.connect(
+            host="localhost",
+            user="root",
+            password="1234",  # Update your MySQL root password
+            database="wellhive"
+        ))
+        create_tables(db_conn)
+    except mysql.connector.Error as e:
+        print(f"Error connecting to MySQL: {e}")
+        sys.exit(1)
+
+    exercise = MeditationExercise(db_conn)
     exercise.show()
+    watch(exercise, "Meditation")
     sys.exit(app.exec())
@@ -0,0 +1,230 @@
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from PySide6.QtCore import QTimer
+import stall_watchdog
+import timeline
+from db_trace import LatencyHistogram
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Export is opt-in: set either or both of these
+METRICS_TEXTFILE = os.environ.get("WELLHIVE_METRICS_TEXTFILE")
+METRICS_PORT = os.environ.get("WELLHIVE_METRICS_PORT")
+TEXTFILE_INTERVAL_MS = 15_000
+
+BUCKETS_SECONDS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+DESCRIPTIONS = {
+    "wellhive_cache_requests_total": ("counter", "Cache lookups by cache and result (hit or miss)."),
+    "wellhive_chart_render_seconds": ("histogram", "Time to query and draw a statistics chart."),
+    "wellhive_pdf_generation_seconds": ("histogram", "Time to query and write a PDF report, excluding dialogs."),
+    "wellhive_tracker_open_seconds": ("histogram", "Time to show a tracker window after its button is clicked, warm or cold."),
+    "wellhive_reminder_delivery_lag_seconds": ("histogram", "Delay between a reminder falling due and being shown."),
+    "wellhive_db_round_trips_total": ("counter", "Statements executed against the database."),
+    "wellhive_db_rows_total": ("counter", "Rows returned or affected by tracker queries."),
+    "wellhive_db_query_seconds": ("histogram", "Database round trip time, execute to last fetch."),
+    "wellhive_event_loop_stalls_total": ("counter", "Event loop stalls longer than the watchdog threshold."),
+    "wellhive_event_loop_lateness_seconds": ("histogram", "Lateness of the event loop heartbeat."),
+    "wellhive_process_resident_memory_bytes": ("gauge", "Resident set size of this process."),
+}
+
+
+class MetricsRegistry:
+    """Labelled counters and histograms recorded by the trackers in this process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}    # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> LatencyHistogram in microseconds
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = LatencyHistogram()
+            histogram.record(seconds * 1e6)
+
+    def samples(self):
+        """Copies of the counters and histograms, taken under the lock."""
+        with self.lock:
+            counters = dict(self.counters)
+            histograms = {}
+            for key, histogram in self.histograms.items():
+                copy = LatencyHistogram()
+                copy.merge(histogram)
+                histograms[key] = copy
+        return counters, histograms
+
+
+registry = MetricsRegistry()
+
+
+def inc(name, amount=1, **labels):
+    registry.inc(name, amount, **labels)
+
+
+def observe(name, seconds, **labels):
+    registry.observe(name, seconds, **labels)
+
+
+def trim_slot_args(function):
+    """Wrap a method so callers may pass extra trailing arguments.
+
+    Qt signals such as clicked(bool) pass their arguments to any slot whose
+    signature accepts them; a *args wrapper would otherwise forward those
+    arguments to methods that do not expect them.
+    """
+    parameters = inspect.signature(function).parameters.values()
+    if any(parameter.kind == inspect.Parameter.VAR_POSITIONAL for parameter in parameters):
+        return function
+    arity = sum(1 for parameter in parameters
+                if parameter.kind in (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD))
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        return function(*args[:arity], **kwargs)
+    return wrapper
+
+
+def timed(name, **labels):
+    """Decorator recording each call's duration in the named histogram."""
+    def decorate(function):
+        call = trim_slot_args(function)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return call(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - started, **labels)
+        return wrapper
+    return decorate
+
+
+def process_rss_bytes():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+def histogram_lines(name, labels, histogram):
+    lines = []
+    for bound in BUCKETS_SECONDS:
+        count = histogram.count_at_or_below(bound * 1e6)
+        lines.append(f"{name}_bucket{format_labels(labels, [('le', repr(bound))])} {count}")
+    lines.append(f"{name}_bucket{format_labels(labels, [('le', '+Inf')])} {histogram.count}")
+    lines.append(f"{name}_sum{format_labels(labels)} {histogram.total_us / 1e6:.6f}")
+    lines.append(f"{name}_count{format_labels(labels)} {histogram.count}")
+    return lines
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    counters, histograms = registry.samples()
+
+    watchdog = stall_watchdog.watchdog
+    if watchdog is not None:
+        counters[("wellhive_event_loop_stalls_total", ())] = watchdog.stalls
+        lateness = LatencyHistogram()
+        lateness.merge(watchdog.lateness)
+        histograms[("wellhive_event_loop_lateness_seconds", ())] = lateness
+
+    lines = []
+    described = set()
+
+    def describe(name):
+        if name not in described and name in DESCRIPTIONS:
+            kind, text = DESCRIPTIONS[name]
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+            described.add(name)
+
+    for (name, labels), value in sorted(counters.items()):
+        describe(name)
+        lines.append(f"{name}{format_labels(labels)} {value}")
+    for (name, labels), histogram in sorted(histograms.items(), key=lambda item: item[0]):
+        describe(name)
+        lines.extend(histogram_lines(name, labels, histogram))
+
+    rss = process_rss_bytes()
+    if rss is not None:
+        describe("wellhive_process_resident_memory_bytes")
+        lines.append(f"wellhive_process_resident_memory_bytes {rss}")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path):
+    """Write atomically, as the node_exporter textfile collector expects."""
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as output:
+        output.write(render())
+    os.replace(temporary, path)
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        with timeline.span("metrics.render", "metrics"):
+            body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_exporters(parent=None):
+    """Start whichever exporters are configured; returns the textfile timer, if any."""
+    if METRICS_PORT:
+        try:
+            server = ThreadingHTTPServer(("127.0.0.1", int(METRICS_PORT)), MetricsHandler)
+        except (OSError, ValueError) as e:
+            print(f"Could not serve metrics on port {METRICS_PORT}: {e}", file=sys.stderr)
+        else:
+            threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+
+    if METRICS_TEXTFILE:
+        timer = QTimer(parent)
+
+        def export():
+            try:
+                write_textfile(METRICS_TEXTFILE)
+            except OSError as e:
+                print(f"Could not write metrics to {METRICS_TEXTFILE}: {e}", file=sys.stderr)
+
+        timer.timeout.connect(export)
+        timer.start(TEXTFILE_INTERVAL_MS)
+        return timer
+    return None
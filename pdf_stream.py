@@ -0,0 +1,77 @@
+from reportlab.lib.pagesizes import letter
+from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame
+import timeline
+
+
+class FlowableStream:
+    """A list-like view over a flowable generator, for BaseDocTemplate.build.
+
+    Platypus consumes its flowable list from the front (flowables[0],
+    del flowables[0]) and pushes split remainders back with slice assignment.
+    This class supports exactly those operations while pulling only a small
+    look-ahead from the generator, so a long report never materialises all of
+    its flowables at once.
+    """
+
+    def __init__(self, flowables, lookahead=8):
+        self.source = iter(flowables)
+        self.buffer = []
+        self.lookahead = lookahead
+        self.exhausted = False
+
+    def fill(self, size):
+        while len(self.buffer) < size and not self.exhausted:
+            try:
+                self.buffer.append(next(self.source))
+            except StopIteration:
+                self.exhausted = True
+
+    def __len__(self):
+        self.fill(self.lookahead)
+        return len(self.buffer)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            self.fill(index.stop if index.stop is not None else self.lookahead)
+        else:
+            self.fill(index + 1)
+        return self.buffer[index]
+
+    def __setitem__(self, index, value):
+        self.buffer[index] = value
+
+    def __delitem__(self, index):
+        self.fill(1)
+        del self.buffer[index]
+
+    def insert(self, index, value):
+        self.buffer.insert(index, value)
+
+    def pop(self, index=0):
+        self.fill(index + 1)
+        return self.buffer.pop(index)
+
+
+def background_template(background, pagesize=letter, margin=50):
+    """A page template that paints the background ImageReader, if any, under every page's frame."""
+    width, height = pagesize
+
+    def draw_background(pdf, doc):
+        if background is not None:
+            # The same ImageReader is embedded once and referenced from each page
+            pdf.drawImage(background, 0, 0, width=width, height=height, mask='auto')
+
+    frame = Frame(margin, margin, width - 2 * margin, height - 2 * margin, id="body")
+    return PageTemplate(id="background", frames=[frame], onPage=draw_background, pagesize=pagesize)
+
+
+def build_streamed_pdf(file_path, flowables, background=None, pagesize=letter):
+    """Lay out flowables from a generator onto pages carrying the background image."""
+    doc = BaseDocTemplate(file_path, pagesize=pagesize, pageCompression=1)
+    doc.addPageTemplates([background_template(background, pagesize)])
+    # Layout and writing interleave with the generator's DB batches, which get their own spans
+    with timeline.span("pdf.build"):
+        doc.build(FlowableStream(flowables))
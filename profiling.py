@@ -0,0 +1,158 @@
+import cProfile
+import functools
+import io
+import os
+import pstats
+import re
+import sys
+import time
+import tracemalloc
+from PySide6.QtCore import QAbstractEventDispatcher
+import timeline
+from metrics import trim_slot_args
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles")
+TOP_FUNCTIONS = 30
+TOP_ALLOCATIONS = 20
+
+
+def profile_directory(argv, environ):
+    """Directory from --profile[=dir] or WELLHIVE_PROFILE, or None when profiling is off."""
+    for arg in argv[1:]:
+        if arg == "--profile":
+            return DEFAULT_PROFILE_DIR
+        if arg.startswith("--profile="):
+            return arg.split("=", 1)[1] or DEFAULT_PROFILE_DIR
+    value = environ.get("WELLHIVE_PROFILE", "")
+    if value in ("", "0"):
+        return None
+    return DEFAULT_PROFILE_DIR if value == "1" else value
+
+
+class ActionProfiler:
+    """Profiles user actions one at a time with cProfile and tracemalloc.
+
+    Each outermost action writes <time>-<n>-<window>-<action>.pstats, loadable
+    with pstats or snakeviz, and a .txt summary with wall time, the hottest
+    functions and the allocation sites that grew most during the action.
+    Actions triggered from inside another action are part of the outer profile.
+
+    An action that opens a dialog runs a nested event loop while the user
+    answers it. The profile clock stops whenever that loop blocks waiting for
+    input, so wall and cProfile times cover only the work, not the user.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.active = False
+        self.sequence = 0
+        self.idle = 0.0  # seconds the current action spent blocked in a nested event loop
+        self.blocked_at = None
+        self.woke_at = None
+        self.awake_returning = False
+        os.makedirs(directory, exist_ok=True)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        dispatcher = QAbstractEventDispatcher.instance()
+        if dispatcher is not None:
+            dispatcher.aboutToBlock.connect(self.about_to_block)
+            dispatcher.awake.connect(self.awake)
+        print(f"Profiling user actions into {os.path.abspath(directory)}")
+
+    def about_to_block(self):
+        if self.active:
+            self.blocked_at = time.perf_counter()
+
+    def awake(self):
+        if self.blocked_at is not None:
+            self.woke_at = time.perf_counter()
+            self.awake_returning = True
+
+    def clock(self):
+        """perf_counter without the time spent waiting on the user.
+
+        awake() is itself profiled, and its return is the next reading. The
+        wait is taken off the reading after that, so it comes back out of the
+        dialog call that absorbed it rather than making awake() negative.
+        """
+        if self.woke_at is not None:
+            if self.awake_returning:
+                self.awake_returning = False
+            else:
+                self.idle += self.woke_at - self.blocked_at
+                self.blocked_at = self.woke_at = None
+        return time.perf_counter() - self.idle
+
+    def run(self, label, function, *args, **kwargs):
+        if self.active:
+            return function(*args, **kwargs)
+
+        self.active = True
+        self.idle = 0.0
+        profile = cProfile.Profile(self.clock)
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        started = self.clock()
+        try:
+            return profile.runcall(function, *args, **kwargs)
+        finally:
+            elapsed = self.clock() - started
+            _, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+            self.active = False
+            self.blocked_at = self.woke_at = None
+            self.dump(label, profile, elapsed, self.idle, peak, after.compare_to(before, "lineno"))
+
+    def dump(self, label, profile, elapsed, idle, peak, allocations):
+        now = time.time()
+        self.sequence += 1
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f".{int(now * 1000) % 1000:03d}"
+        name = f"{stamp}-{self.sequence}-" + re.sub(r"[^\w.-]+", "_", label)
+        base = os.path.join(self.directory, name)
+        profile.dump_stats(base + ".pstats")
+
+        stream = io.StringIO()
+        stream.write(f"{label}: {elapsed * 1000:.1f} ms wall, {peak / 1024:.0f} KiB peak traced memory")
+        if idle:
+            stream.write(f" ({idle * 1000:.0f} ms waiting in dialogs excluded)")
+        stream.write("\n\n")
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        stream.write("Top allocation sites (growth during the action):\n")
+        for stat in allocations[:TOP_ALLOCATIONS]:
+            stream.write(f"  {stat}\n")
+        with open(base + ".txt", "w", encoding="utf-8") as report:
+            report.write(stream.getvalue())
+
+
+directory = profile_directory(sys.argv, os.environ)
+profiler = None  # created by the first profiled action, so importing this module has no side effects
+
+
+def get_profiler():
+    global profiler
+    if profiler is None and directory:
+        profiler = ActionProfiler(directory)
+    return profiler
+
+
+def action(name):
+    """Decorator marking a user action.
+
+    The action is profiled when profiling is on and becomes a timeline span
+    when WELLHIVE_TRACE is set; otherwise the call goes straight through.
+    """
+    def decorate(function):
+        call = trim_slot_args(function)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not directory and not timeline.enabled:
+                return call(*args, **kwargs)
+            owner = type(args[0]).__name__ if args else function.__module__
+            with timeline.span(f"{owner}.{name}"):
+                if not directory:
+                    return call(*args, **kwargs)
+                return get_profiler().run(f"{owner}-{name}", call, *args, **kwargs)
+        return wrapper
+    return decorate
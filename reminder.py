@@ -1,9 +1,62 @@
 from PySide6.QtWidgets import (
-    QApplication, QWidget, QLabel, QVBoxLayout, QPushButton, QTimeEdit, QComboBox, QMessageBox
+    QApplication, QWidget, QLabel, QVBoxLayout, QPushButton, QTimeEdit, QComboBox, QMessageBox, QCheckBox
 )
-from PySide6.QtCore import QTimer, QTime, Qt
+from PySide6.QtCore import QTimer, QTime, QDate, QDateTime, Qt
 from plyer import notification
+import math
 import sys
+from stall_watchdog import watch
+from goals import WATER_GOAL_LITRES
+import metrics
+import profiling
+
+
+class HydrationPacer:
+    """Spreads the rest of today's water goal over the waking hours that are left.
+
+    Only today's running total is kept, so each water save updates the pacing in
+    O(1) without looking at earlier days.
+    """
+
+    def __init__(self, goal_litres=WATER_GOAL_LITRES, glass_litres=0.25,
+                 wake_time=QTime(8, 0), sleep_time=QTime(22, 0), min_gap_minutes=20):
+        self.goal_litres = goal_litres
+        self.glass_litres = glass_litres
+        self.wake_time = wake_time
+        self.sleep_time = sleep_time
+        self.min_gap_secs = min_gap_minutes * 60
+        self.day = None
+        self.intake = 0.0
+
+    def record(self, day, total):
+        """Take a day's new total; totals for days before the latest one are ignored."""
+        if isinstance(day, str):
+            day = QDate.fromString(day, "yyyy-MM-dd")
+        if self.day is None or day >= self.day:
+            self.day = day
+            self.intake = total
+
+    def intake_on(self, day):
+        return self.intake if day == self.day else 0.0
+
+    def remaining(self, day):
+        return max(self.goal_litres - self.intake_on(day), 0.0)
+
+    def next_reminder(self, now):
+        """When to remind next: one glass per equal slice of the waking time left."""
+        today = now.date()
+        wake = QDateTime(today, self.wake_time)
+        sleep = QDateTime(today, self.sleep_time)
+        if now < wake:
+            return wake
+
+        remaining = self.remaining(today)
+        if remaining <= 0 or now >= sleep:
+            return QDateTime(today.addDays(1), self.wake_time)
+
+        glasses = math.ceil(remaining / self.glass_litres)
+        gap = max(now.secsTo(sleep) // glasses, self.min_gap_secs)
+        return now.addSecs(gap)
 
 
 class ReminderFeature(QWidget):
@@ -11,7 +64,7 @@ class ReminderFeature(QWidget):
         super().__init__()
 
         self.setWindowTitle("WellHive - Reminders")
-        self.setFixedSize(400, 350)
+        self.setFixedSize(400, 420)
 
         # Main Layout
         layout = QVBoxLayout()
@@ -42,8 +95,23 @@ class ReminderFeature(QWidget):
         self.set_reminder_button.clicked.connect(self.set_reminder)
         layout.addWidget(self.set_reminder_button)
 
+        # Adaptive Hydration Reminders
+        self.hydration = HydrationPacer()
+        self.hydration_timer = QTimer(self)
+        self.hydration_timer.setSingleShot(True)
+        self.hydration_timer.timeout.connect(self.trigger_hydration_reminder)
+
+        self.adaptive_water_checkbox = QCheckBox("Adaptive hydration reminders")
+        self.adaptive_water_checkbox.toggled.connect(self.schedule_hydration_reminder)
+        layout.addWidget(self.adaptive_water_checkbox)
+
+        self.next_water_label = QLabel("Adaptive hydration reminders are off.")
+        self.next_water_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.next_water_label)
+
         # Reminder Storage
         self.reminders = []
+        self.notifications = []  # ad-hoc (activity, message, queued at), shown on the next tick
 
         # Timer for Notifications and Current Time Update
         self.timer = QTimer(self)
@@ -70,26 +138,70 @@ class ReminderFeature(QWidget):
         self.reminders.append((activity, time_str))
         QMessageBox.information(self, "Reminder Set", f"Reminder for '{activity}' set at {time_str}.")
 
+    def update_water_intake(self, date, total):
+        """Re-pace hydration reminders after a water save."""
+        self.hydration.record(date, total)
+        self.schedule_hydration_reminder()
+
+    def schedule_hydration_reminder(self):
+        """Arm the single-shot hydration timer for the pacer's next reminder."""
+        self.hydration_timer.stop()
+        if not self.adaptive_water_checkbox.isChecked():
+            self.next_water_label.setText("Adaptive hydration reminders are off.")
+            return
+
+        now = QDateTime.currentDateTime()
+        next_time = self.hydration.next_reminder(now)
+        self.hydration_due = next_time
+        self.hydration_timer.start(max(now.msecsTo(next_time), 0))
+        remaining = self.hydration.remaining(now.date())
+        self.next_water_label.setText(
+            f"{remaining:.2f} L to go today. Next reminder at {next_time.toString('ddd HH:mm')}.")
+
+    def trigger_hydration_reminder(self):
+        today = QDate.currentDate()
+        remaining = self.hydration.remaining(today)
+        if remaining > 0 and QTime.currentTime() >= self.hydration.wake_time:
+            self.record_delivery_lag("hydration", self.hydration_due.msecsTo(QDateTime.currentDateTime()))
+            self.trigger_reminder(
+                "Drink Water", f"Time for a glass of water!\n{remaining:.2f} L left to reach today's goal.")
+        self.schedule_hydration_reminder()
+
+    def push_notification(self, activity, message):
+        """Queue an ad-hoc notification, e.g. from the anomaly detector."""
+        self.notifications.append((activity, message, QDateTime.currentDateTime()))
+
     def check_reminders(self):
         """Check if any reminders match the current time."""
+        while self.notifications:
+            activity, message, queued_at = self.notifications.pop(0)
+            self.record_delivery_lag("adhoc", queued_at.msecsTo(QDateTime.currentDateTime()))
+            self.trigger_reminder(activity, message)
         current_time = QTime.currentTime().toString("HH:mm")
         for activity, time in self.reminders:
             if time == current_time:
+                self.record_delivery_lag("scheduled", QTime.fromString(time, "HH:mm").msecsTo(QTime.currentTime()))
                 self.trigger_reminder(activity)
                 self.reminders.remove((activity, time))  # Remove reminder after triggering
 
-    def trigger_reminder(self, activity):
+    def record_delivery_lag(self, kind, lag_ms):
+        metrics.observe("wellhive_reminder_delivery_lag_seconds", max(lag_ms, 0) / 1000, kind=kind)
+
+    @profiling.action("reminder")
+    def trigger_reminder(self, activity, message=None):
         """Trigger both a desktop notification and a pop-up notification."""
+        if message is None:
+            message = f"It's time to {activity}!\nStay consistent for a better you."
         # Desktop Notification
         notification.notify(
             title="WellHive Reminder",
-            message=f"It's time to {activity}!\nStay consistent for a better you.",
+            message=message,
             timeout=10  # Notification duration in seconds
         )
         # Pop-Up Notification
         reminder_popup = QMessageBox(self)
         reminder_popup.setWindowTitle("WellHive Reminder")
-        reminder_popup.setText(f"It's time to {activity}!\nStay consistent for a better you.")
+        reminder_popup.setText(message)
         reminder_popup.setIcon(QMessageBox.Information)
         reminder_popup.setStandardButtons(QMessageBox.Ok)
         reminder_popup.exec()
@@ -100,5 +212,6 @@ if __name__ == "__main__":
 
     reminder_window = ReminderFeature()
     reminder_window.show()
+    watch(reminder_window, "Reminder")
 
     sys.exit(app.exec())
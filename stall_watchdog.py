@@ -0,0 +1,133 @@
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+import traceback
+from PySide6.QtCore import QObject, QTimer, Qt
+from PySide6.QtWidgets import QApplication
+from db_trace import LatencyHistogram
+import timeline
+
+# A heartbeat later than this counts as a stall of the event loop
+STALL_MS = float(os.environ.get("WELLHIVE_STALL_MS", "250"))
+STALL_LOG = os.environ.get("WELLHIVE_STALL_LOG", os.path.join(os.path.dirname(os.path.abspath(__file__)), "stalls.log"))
+HEARTBEAT_MS = 20
+NAME_PROPERTY = "stallWatchdogName"
+
+stall_log = logging.getLogger("wellhive.stalls")
+
+
+def setup_stall_log(path=STALL_LOG):
+    """Rotate stall reports at 1 MB, keeping five old files."""
+    if not stall_log.handlers:
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=1_000_000, backupCount=5, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        stall_log.addHandler(handler)
+        stall_log.setLevel(logging.INFO)
+        stall_log.propagate = False
+
+
+class StallWatchdog(QObject):
+    """Watches the Qt event loop for stalls.
+
+    One precise heartbeat timer runs on the main thread for the whole process;
+    the lateness of each beat goes into a histogram. A helper thread checks how
+    long ago the last beat was. When that exceeds the threshold, it captures
+    the main thread's Python stack while the stall is still in progress, so the
+    report shows the DB call, chart draw or PDF render that is blocking.
+
+    A modal dialog's exec() runs a nested event loop, so heartbeats keep coming
+    and it is never a stall. Time spent in modal dialogs is logged separately.
+    """
+
+    def __init__(self, threshold_ms=STALL_MS, parent=None):
+        super().__init__(parent)
+        setup_stall_log()
+        self.threshold_s = threshold_ms / 1000
+        self.lateness = LatencyHistogram()
+        self.stalls = 0
+        self.last_beat = time.monotonic()
+        self.last_window = None
+        self.reported = False  # a report has been written for the current stall
+        self.modal = None  # (dialog, name, opened at, timeline start) while a modal dialog is up
+        self.main_thread_id = threading.main_thread().ident
+
+        self.expected = self.last_beat + HEARTBEAT_MS / 1000
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(HEARTBEAT_MS)
+        self.timer.timeout.connect(self.beat)
+        self.timer.start()
+
+        self.monitor = threading.Thread(target=self.monitor_loop, name="stall-watchdog", daemon=True)
+        self.monitor.start()
+
+    def watch(self, window, name):
+        """Name window in stall and modal reports; the process-wide heartbeat does the measuring."""
+        window.setProperty(NAME_PROPERTY, name)
+
+    def window_name(self, window):
+        if window is None:
+            return "no active window"
+        return window.property(NAME_PROPERTY) or window.windowTitle() or type(window).__name__
+
+    def beat(self):
+        now = time.monotonic()
+        late_s = max(now - self.expected, 0.0)
+        self.expected = now + HEARTBEAT_MS / 1000
+        self.check_modal(now)
+        self.heartbeat(self.window_name(QApplication.activeWindow()), now, late_s)
+
+    def check_modal(self, now):
+        """Log when a modal dialog opens and how long it kept its nested event loop running."""
+        dialog = QApplication.activeModalWidget()
+        if self.modal is not None and dialog is not self.modal[0]:
+            _, name, opened, started_us = self.modal
+            stall_log.info("Modal dialog %s closed after %.0f ms", name, (now - opened) * 1000)
+            timeline.complete(f"modal {name}", started_us, timeline.now_us() - started_us, "watchdog")
+            self.modal = None
+        if dialog is not None and self.modal is None:
+            name = self.window_name(dialog)
+            self.modal = (dialog, name, now, timeline.now_us())
+            stall_log.info("Modal dialog %s opened over %s", name, self.last_window)
+
+    def heartbeat(self, name, now, late_s):
+        self.lateness.record(late_s * 1e6)
+        stalled_s = now - self.last_beat
+        self.last_beat = now
+        self.last_window = name
+        if self.reported:
+            stall_log.info("Event loop resumed in %s after %.0f ms", name, stalled_s * 1000)
+            self.reported = False
+
+    def monitor_loop(self):
+        while True:
+            time.sleep(self.threshold_s / 4)
+            stalled_s = time.monotonic() - self.last_beat
+            if stalled_s >= self.threshold_s and not self.reported:
+                self.reported = True
+                self.stalls += 1
+                with timeline.span("watchdog.report", "watchdog", stalled_ms=round(stalled_s * 1000)):
+                    self.report(stalled_s)
+
+    def report(self, stalled_s):
+        frame = sys._current_frames().get(self.main_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "  (main thread stack unavailable)\n"
+        stall_log.info(
+            "Event loop stalled for %.0f ms so far (last heartbeat from %s). Main thread stack:\n%s",
+            stalled_s * 1000, self.last_window, stack,
+        )
+
+
+watchdog = None
+
+
+def watch(window, name):
+    """Name window in the process-wide watchdog's reports, creating the watchdog on first use."""
+    global watchdog
+    if watchdog is None:
+        watchdog = StallWatchdog()
+    watchdog.watch(window, name)
+    return watchdog
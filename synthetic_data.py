@@ -0,0 +1,166 @@
+import argparse
+import random
+import sys
+from datetime import date as Date, datetime, time as Time, timedelta
+import mysql.connector
+import mood
+import Sleep
+import Water_tracker
+import gra
+import med
+
+FLUSH_DAYS = 100  # days of rows sent per executemany batch
+
+INSERTS = {
+    "sleep": "REPLACE INTO sleep_entries (date, duration, bedtime, wake_time) VALUES (%s, %s, %s, %s)",
+    "water_events": "INSERT INTO water_events (logged_at, amount) VALUES (%s, %s)",
+    "water_daily": "REPLACE INTO water_daily (date, intake, drinks) VALUES (%s, %s, %s)",
+    "mood": "INSERT INTO mood_checkins (checked_at, mood_code) VALUES (%s, %s)",
+    "gratitude": "REPLACE INTO gratitude_entries (date, gratitude) VALUES (%s, %s)",
+    "meditation": """
+        INSERT INTO meditation_sessions
+            (started_at, ended_at, breath_in_seconds, breath_out_seconds,
+             planned_minutes, cycles_completed, interrupted)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """,
+}
+
+GRATITUDE_PHRASES = [
+    "a long walk in the park", "a call with an old friend", "a quiet cup of tea", "finishing a hard task",
+    "my family's support", "a good book before bed", "sunshine after a week of rain", "a kind word from a colleague",
+    "cooking dinner together", "a productive morning", "laughing until my sides hurt", "a warm shower",
+    "my health", "a surprise message", "learning something new", "time outdoors", "a peaceful evening",
+]
+
+MOOD_CODES = {name: code for code, name in mood.MOOD_NAMES.items()}
+
+
+def moods_for(sleep_hours, rng):
+    """Pick a mood for a day, nudged towards worse moods after short nights."""
+    weights = {"Happy": 4, "Neutral": 5, "Excited": 2, "Sad": 2, "Stressed": 2, "Angry": 1}
+    if sleep_hours is not None and sleep_hours < 6:
+        for name in ("Sad", "Stressed", "Angry"):
+            weights[name] *= 3
+    elif sleep_hours is not None and sleep_hours > 7.5:
+        for name in ("Happy", "Excited"):
+            weights[name] *= 2
+    names = list(weights)
+    return rng.choices(names, [weights[name] for name in names])[0]
+
+
+def user_days(years, end_date, rng):
+    """Yield one day's rows for every day in the period, oldest first."""
+    day = end_date - timedelta(days=round(365.25 * years) - 1)
+    while day <= end_date:
+        weekend = day.weekday() >= 5
+        rows = {"sleep": None, "water_events": [], "mood": [], "gratitude": None, "meditation": None}
+
+        # Sleep: ~95% of nights logged, longer on weekends
+        sleep_hours = None
+        if rng.random() < 0.95:
+            sleep_hours = min(max(rng.gauss(7.6 if weekend else 7.0, 0.9), 3.0), 11.0)
+            bedtime = datetime.combine(day - timedelta(days=1), Time(23, 15)) + timedelta(minutes=rng.gauss(0, 45))
+            wake = bedtime + timedelta(hours=sleep_hours)
+            rows["sleep"] = (day, round(sleep_hours, 2), bedtime.replace(microsecond=0), wake.replace(microsecond=0))
+
+        # Water: a handful of drinks between 7:00 and 22:00
+        for _ in range(rng.randint(4, 10)):
+            logged_at = datetime.combine(day, Time(7)) + timedelta(seconds=rng.randrange(15 * 3600))
+            rows["water_events"].append((logged_at, round(rng.choice([0.15, 0.2, 0.25, 0.33, 0.5]), 2)))
+
+        # Mood: one to three check-ins, correlated with last night's sleep
+        for _ in range(rng.choices([1, 2, 3], [6, 3, 1])[0]):
+            checked_at = datetime.combine(day, Time(8)) + timedelta(seconds=rng.randrange(14 * 3600))
+            rows["mood"].append((checked_at, MOOD_CODES[moods_for(sleep_hours, rng)]))
+
+        # Gratitude on ~60% of days
+        if rng.random() < 0.6:
+            picks = rng.sample(GRATITUDE_PHRASES, rng.randint(1, 3))
+            rows["gratitude"] = (day, "Grateful for " + ", ".join(picks) + ".")
+
+        # Meditation on ~30% of days
+        if rng.random() < 0.3:
+            planned = rng.choice([5, 10, 15, 20])
+            started = datetime.combine(day, Time(6, 30)) + timedelta(minutes=rng.randrange(16 * 60))
+            interrupted = rng.random() < 0.1
+            minutes = planned * (rng.uniform(0.3, 0.9) if interrupted else 1)
+            rows["meditation"] = (started, started + timedelta(minutes=minutes), 4, 4, planned,
+                                  int(minutes * 60 // 8), interrupted)
+
+        yield day, rows
+        day += timedelta(days=1)
+
+
+def flush(cursor, batches):
+    for name, rows in batches.items():
+        if rows:
+            cursor.executemany(INSERTS[name], rows)
+            rows.clear()
+
+
+def fill_database(db_conn, years, seed=0, end_date=None):
+    """Create the tracker tables and fill them with years of data ending at end_date."""
+    for module in (mood, Sleep, Water_tracker, gra, med):
+        module.create_tables(db_conn)
+
+    rng = random.Random(seed)
+    cursor = db_conn.cursor()
+    batches = {name: [] for name in INSERTS}
+    pending = 0
+    for day, rows in user_days(years, end_date or Date.today(), rng):
+        if rows["sleep"]:
+            batches["sleep"].append(rows["sleep"])
+        batches["water_events"].extend(rows["water_events"])
+        total = round(sum(amount for _, amount in rows["water_events"]), 2)
+        batches["water_daily"].append((day, total, len(rows["water_events"])))
+        batches["mood"].extend(rows["mood"])
+        if rows["gratitude"]:
+            batches["gratitude"].append(rows["gratitude"])
+        if rows["meditation"]:
+            batches["meditation"].append(rows["meditation"])
+
+        pending += 1
+        if pending >= FLUSH_DAYS:
+            flush(cursor, batches)
+            pending = 0
+    flush(cursor, batches)
+    db_conn.commit()
+
+
+def user_database(prefix, user):
+    return f"{prefix}_{user:04d}"
+
+
+def generate(users, years, host="localhost", user="root", password="1234", prefix="wellhive_bench", seed=0):
+    """One database per synthetic user, each holding `years` of history. Existing databases are replaced."""
+    server = mysql.connector.connect(host=host, user=user, password=password)
+    cursor = server.cursor()
+    for index in range(users):
+        name = user_database(prefix, index)
+        cursor.execute(f"DROP DATABASE IF EXISTS `{name}`")
+        cursor.execute(f"CREATE DATABASE `{name}`")
+        db_conn = mysql.connector.connect(host=host, user=user, password=password, database=name)
+        try:
+            fill_database(db_conn, years, seed=seed + index)
+        finally:
+            db_conn.close()
+        print(f"Filled {name} with {years} year(s) of data")
+    server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill WellHive tracker tables with realistic synthetic data.")
+    parser.add_argument("--users", type=int, default=1, help="number of users; each gets its own database")
+    parser.add_argument("--years", type=float, default=1, help="years of history per user")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--user", default="root")
+    parser.add_argument("--password", default="1234")
+    parser.add_argument("--prefix", default="wellhive_bench", help="database name prefix")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    try:
+        generate(args.users, args.years, args.host, args.user, args.password, args.prefix, args.seed)
+    except mysql.connector.Error as e:
+        print(f"Error connecting to MySQL: {e}")
+        sys.exit(1)
@@ -0,0 +1,126 @@
+import os
+import random
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtCore = pytest.importorskip("PySide6.QtCore")
+
+from breathing_pacer import BreathingPacer
+
+
+class FakeClock:
+    """Stands in for the pacer's QElapsedTimer; time only moves when the test advances it."""
+
+    def __init__(self):
+        self.now_ns = 0
+        self.started_ns = None
+
+    def start(self):
+        self.started_ns = self.now_ns
+
+    def isValid(self):
+        return self.started_ns is not None
+
+    def nsecsElapsed(self):
+        return self.now_ns - self.started_ns
+
+    def advance(self, ms):
+        self.now_ns += round(ms * 1_000_000)
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+@pytest.fixture
+def pacer(app):
+    pacer = BreathingPacer()
+    pacer.clock = FakeClock()
+    fired = []
+    pacer.breath_in.connect(lambda ms: fired.append(("in", pacer.elapsed_ms())))
+    pacer.breath_out.connect(lambda ms: fired.append(("out", pacer.elapsed_ms())))
+    pacer.finished.connect(lambda: fired.append(("end", pacer.elapsed_ms())))
+    pacer.fired = fired
+    return pacer
+
+
+def fire_next_shot(pacer, jitter_ms):
+    """Let the armed single-shot timer expire jitter_ms after its interval, as a busy event loop would."""
+    pacer.clock.advance(pacer.timer.interval() + jitter_ms)
+    pacer.timer.stop()
+    pacer._on_deadline()
+
+
+def run_until_idle(pacer, jitter, limit=100_000):
+    for _ in range(limit):
+        if not pacer.timer.isActive():
+            return
+        fire_next_shot(pacer, jitter())
+    raise AssertionError("pacer never went idle")
+
+
+def test_cues_land_on_absolute_deadlines(pacer):
+    pacer.start(4000, 6000, 60_000)
+    expected = [(0, "in")]
+    for cycle_start in range(0, 60_000, 10_000):
+        if cycle_start:
+            expected.append((cycle_start, "in"))
+        expected.append((cycle_start + 4000, "out"))
+    expected.append((60_000, "end"))
+    assert pacer.cues == expected
+
+    run_until_idle(pacer, lambda: 0)
+    assert [kind for kind, _ in pacer.fired] == [kind for _, kind in expected]
+    for (kind, fired_at), (deadline, _) in zip(pacer.fired, expected):
+        assert deadline <= fired_at < deadline + 1
+
+
+def test_jitter_does_not_accumulate_over_a_long_session(pacer):
+    # An hour of 1 s in, 1 s out: 3600 cues, each shot up to 4 ms late and some woken early.
+    rng = random.Random(42)
+    pacer.start(1000, 1000, 60 * 60 * 1000)
+    deadlines = [deadline for deadline, _ in pacer.cues]
+
+    run_until_idle(pacer, lambda: rng.choice((-3, 0, 1, 2, 3, 4)))
+    assert len(pacer.fired) == len(deadlines) == 3600 + 1
+    drift = [fired_at - deadline for (_, fired_at), deadline in zip(pacer.fired, deadlines)]
+    assert min(drift) >= 0
+    assert max(drift) < 5
+    assert pacer.max_lateness_ms < 5
+    assert not pacer.is_active()
+
+
+def test_early_wakeup_rearms_for_the_same_deadline(pacer):
+    pacer.start(5000, 5000, 20_000)
+    fire_next_shot(pacer, 0)  # the "in" cue at 0 ms
+    pacer.clock.advance(4000)
+    pacer.timer.stop()
+    pacer._on_deadline()
+    assert [kind for kind, _ in pacer.fired] == ["in"]
+    assert pacer.timer.isActive() and pacer.timer.interval() == 1000
+
+
+def test_earlier_session_cannot_stop_a_later_one(pacer):
+    pacer.start(2000, 2000, 10_000)
+    fire_next_shot(pacer, 0)
+    pacer.clock.advance(3000)
+    pacer.stop()
+    assert not pacer.timer.isActive()
+    assert pacer.fired == [("in", 0)]
+
+    # The second session starts 3 s in, so the first one's end would fall 7 s into it.
+    pacer.start(2000, 2000, 30_000)
+    pacer.fired.clear()
+    for _ in range(4):  # cues at 0, 2, 4 and 6 s
+        fire_next_shot(pacer, 0)
+    pacer.clock.advance(1000)
+    pacer.timer.stop()
+    pacer._on_deadline()  # a stray shot at the first session's end time
+    assert pacer.is_active()
+    assert pacer.next_deadline_ms() == 8000
+    assert [kind for kind, _ in pacer.fired] == ["in", "out", "in", "out"]
+
+    run_until_idle(pacer, lambda: 0)
+    ends = [fired_at for kind, fired_at in pacer.fired if kind == "end"]
+    assert ends == [30_000]
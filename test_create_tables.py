@@ -0,0 +1,67 @@
+import os
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+pytest.importorskip("PySide6.QtWidgets")
+errors = pytest.importorskip("mysql.connector.errors")
+
+import mood
+import Water_tracker
+
+
+class EmptySchemaCursor:
+    """An unbuffered cursor on a schema with no tables yet.
+
+    Like mysql-connector, it refuses to run another statement or commit while
+    a SELECT result is still unread.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        self.conn.check_unread()
+        query = " ".join(sql.split())
+        self.conn.statements.append(query)
+        if query.startswith("SELECT is_nullable"):
+            self.conn.unread = [("YES",)]
+        elif query.startswith("SELECT"):
+            self.conn.unread = [(0,)]
+
+    def executemany(self, sql, rows):
+        self.conn.check_unread()
+        self.conn.statements.append(" ".join(sql.split()))
+
+    def fetchone(self):
+        rows, self.conn.unread = self.conn.unread, None
+        return rows[0] if rows else None
+
+    def close(self):
+        pass
+
+
+class EmptySchemaConnection:
+    def __init__(self):
+        self.unread = None
+        self.statements = []
+        self.commits = 0
+
+    def check_unread(self):
+        if self.unread is not None:
+            raise errors.InternalError("Unread result found")
+
+    def cursor(self):
+        return EmptySchemaCursor(self)
+
+    def commit(self):
+        self.check_unread()
+        self.commits += 1
+
+
+@pytest.mark.parametrize("module", [mood, Water_tracker], ids=["mood", "water"])
+def test_create_tables_on_an_empty_schema(module):
+    conn = EmptySchemaConnection()
+    module.create_tables(conn)
+    assert conn.commits == 1
+    # Nothing to migrate without the old table
+    assert not any(statement.startswith("INSERT INTO") for statement in conn.statements)
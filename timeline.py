@@ -0,0 +1,78 @@
+import atexit
+import contextlib
+import json
+import os
+import threading
+import time
+
+# Set WELLHIVE_TRACE=path to record spans. Each process writes its own file when it exits, with its
+# pid before the extension (trace.json -> trace.1234.json), since tracker processes inherit the setting
+TRACE_PATH = os.environ.get("WELLHIVE_TRACE")
+MAX_EVENTS = 1_000_000
+
+enabled = bool(TRACE_PATH)
+lock = threading.Lock()
+events = []
+named_threads = set()
+origin_ns = time.perf_counter_ns()
+
+
+def now_us():
+    return (time.perf_counter_ns() - origin_ns) / 1000
+
+
+def complete(name, start_us, duration_us, category="action", **args):
+    """Record a finished span as a Chrome Trace "X" event on the calling thread."""
+    if not enabled:
+        return
+    thread = threading.current_thread()
+    tid = threading.get_native_id()
+    event = {"name": name, "cat": category, "ph": "X", "ts": start_us, "dur": duration_us,
+             "pid": os.getpid(), "tid": tid}
+    if args:
+        event["args"] = args
+    with lock:
+        if tid not in named_threads:
+            named_threads.add(tid)
+            events.append({"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                           "args": {"name": thread.name}})
+        if len(events) < MAX_EVENTS:
+            events.append(event)
+
+
+@contextlib.contextmanager
+def span(name, category="action", **args):
+    """Time the enclosed block as one span."""
+    if not enabled:
+        yield
+        return
+    started = now_us()
+    try:
+        yield
+    finally:
+        complete(name, started, now_us() - started, category, **args)
+
+
+def process_trace_path():
+    root, extension = os.path.splitext(TRACE_PATH)
+    return f"{root}.{os.getpid()}{extension or '.json'}"
+
+
+def forget_inherited():
+    """Drop the events a forked child inherited from its parent; the parent saves those itself."""
+    with lock:
+        events.clear()
+        named_threads.clear()
+
+
+def save(path=None):
+    """Write the recorded events as Chrome Trace Event JSON, viewable in Perfetto."""
+    path = path or process_trace_path()
+    with lock:
+        trace = {"traceEvents": list(events), "displayTimeUnit": "ms"}
+    with open(path, "w", encoding="utf-8") as output:
+        json.dump(trace, output)
+
+
+if enabled:
+    atexit.register(save)
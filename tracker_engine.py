@@ -0,0 +1,741 @@
+import time
+import mysql.connector
+from PySide6.QtWidgets import (
+    QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton, QCalendarWidget, QTextEdit, QLineEdit,
+    QComboBox, QTabWidget, QFileDialog, QMessageBox, QInputDialog
+)
+from PySide6.QtGui import QFont, QPalette, QBrush
+from PySide6.QtCore import Qt, QDate, QTime
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import letter
+from goals import StreakGoal
+from downsample import downsample_dates
+import image_cache
+import metrics
+import profiling
+import timeline
+
+SAVE_BUTTON_STYLE = """
+    QPushButton {
+        background-color: #4CAF50;
+        color: white;
+        font-size: 14px;
+        padding: 10px;
+        border-radius: 5px;
+    }
+    QPushButton:hover {
+        background-color: #45A049;
+    }
+"""
+
+CHART_NAMES = {"bar": "Bar Chart", "pie": "Pie Chart", "area": "Area Chart"}
+PIE_COLORS = ["#ff9999", "#66b3ff", "#99ff99", "#ffcc99", "#c2c2f0", "#ffb3e6"]
+SQL_TYPES = {float: "FLOAT", int: "INT", str: "TEXT"}
+
+# Report period -> first day of the period, given today
+PERIODS = {
+    "Today": lambda today: today,
+    "This Week": lambda today: today.addDays(-7),
+    "This Month": lambda today: today.addMonths(-1),
+    "This Year": lambda today: today.addYears(-1),
+    "All Entries": lambda today: QDate(1000, 1, 1),
+}
+
+
+class MetricDefinition:
+    """What one tracker stores and how it is entered, charted and reported.
+
+    A plain one-value-per-day metric needs nothing but its definition:
+
+        STEPS = MetricDefinition("steps", "Step Counter", "step_entries", "steps",
+                                 value_type=int, unit="steps", goal_target=8000)
+        create_table(db_conn, STEPS)
+        window = TrackerWindow(db_conn, definition=STEPS)
+
+    With events=True every save is a new timestamped row in date_column, and
+    a day shows its latest row. Trackers with richer storage subclass
+    TrackerWindow and override its input and write_* hooks.
+    """
+
+    def __init__(self, key, title, table, value_column, date_column="date", value_type=float,
+                 choices=(), unit="", value_label=None, events=False, goal_name=None, goal_target=None,
+                 goal_query=None, chart_kinds=("bar", "area"), chart_color="#4CAF50", editable=True,
+                 maximum=100000, report_title=None, report_periods=("This Week",), pdf_background=None,
+                 input_label=None, input_placeholder="", save_text="Save Entry"):
+        self.key = key  # metric label and timeline name
+        self.title = title
+        self.table = table
+        self.value_column = value_column
+        self.date_column = date_column
+        self.value_type = value_type
+        self.choices = list(choices)  # (stored code, display name) pairs
+        self.unit = unit
+        self.value_label = value_label or value_column.replace("_", " ").title()
+        self.events = events
+        self.goal_name = goal_name or value_label or title
+        self.goal_target = goal_target  # None means any entry counts
+        self.chart_kinds = tuple(chart_kinds)
+        self.chart_color = chart_color
+        self.editable = editable
+        self.maximum = maximum
+        self.report_title = report_title or f"{self.value_label} Report"
+        self.report_periods = tuple(report_periods)
+        self.pdf_background = pdf_background  # image_cache asset name
+        self.input_label = input_label or f"{self.value_label}" + (f" (in {unit})" if unit else "")
+        self.input_placeholder = input_placeholder
+        self.save_text = save_text
+
+        if self.choices:
+            self.input_widget = "choice"
+        elif value_type is str:
+            self.input_widget = "text"
+        else:
+            self.input_widget = "number"
+        self.names = dict(self.choices)
+        self.goal_query = goal_query or self.default_goal_query()
+
+    def default_goal_query(self):
+        if self.events:
+            return f"SELECT DISTINCT DATE({self.date_column}), 1 FROM {self.table}"
+        if self.input_widget == "text":
+            return f"SELECT {self.date_column}, 1 FROM {self.table} WHERE TRIM({self.value_column}) <> ''"
+        if self.input_widget == "choice":
+            return f"SELECT {self.date_column}, 1 FROM {self.table}"
+        return f"SELECT {self.date_column}, {self.value_column} FROM {self.table}"
+
+    def day_filter(self):
+        """WHERE clause for one day; takes the day once, or twice for event tables."""
+        if self.events:
+            return f"{self.date_column} >= %s AND {self.date_column} < %s + INTERVAL 1 DAY"
+        return f"{self.date_column} = %s"
+
+    def day_params(self, day):
+        return (day, day) if self.events else (day,)
+
+    def range_filter(self):
+        """WHERE clause for an inclusive range of days; takes (start, end)."""
+        if self.events:
+            return f"{self.date_column} >= %s AND {self.date_column} < %s + INTERVAL 1 DAY"
+        return f"{self.date_column} BETWEEN %s AND %s"
+
+    def format_value(self, value):
+        if self.input_widget == "choice":
+            return self.names.get(value, "Unknown")
+        if self.input_widget == "text":
+            return value or ""
+        return f"{value:g} {self.unit}".rstrip()
+
+    def format_date(self, when):
+        return f"{when:%Y-%m-%d %H:%M}" if self.events else f"{when}"
+
+
+def create_table(db_conn, definition):
+    """Create the table for a definition that has no tracker-specific schema."""
+    d = definition
+    value_type = "TINYINT UNSIGNED" if d.input_widget == "choice" else SQL_TYPES[d.value_type]
+    cursor = db_conn.cursor()
+    if d.events:
+        cursor.execute(f"""
+          CREATE TABLE IF NOT EXISTS {d.table} (
+              id INT UNSIGNED NOT NULL AUTO_INCREMENT,
+              {d.date_column} DATETIME NOT NULL,
+              {d.value_column} {value_type} NOT NULL,
+              PRIMARY KEY (id),
+              INDEX ({d.date_column}, {d.value_column})
+          );
+        """)
+    else:
+        cursor.execute(f"""
+          CREATE TABLE IF NOT EXISTS {d.table} (
+              {d.date_column} DATE NOT NULL,
+              {d.value_column} {value_type} NOT NULL,
+              PRIMARY KEY ({d.date_column})
+          );
+        """)
+    db_conn.commit()
+
+
+class TrackerWindow(QWidget):
+    """The tracker and report tabs shared by every tracker, driven by a MetricDefinition."""
+
+    definition = None
+
+    def __init__(self, db_conn, background_path=None, parent=None, anomaly_detector=None, definition=None):
+        super().__init__(parent)
+        self.definition = definition or self.definition
+        d = self.definition
+        self.db_conn = db_conn
+        self.anomaly_detector = anomaly_detector
+        self.goal = StreakGoal(d.goal_name, d.goal_target, d.unit if d.goal_target is not None else "")
+        self.chart_figure = None
+        self.setFixedSize(800, 600)
+        self.setWindowTitle(d.title)
+
+        # Main Layout
+        main_layout = QVBoxLayout(self)
+        self.tabs = QTabWidget()
+        main_layout.addWidget(self.tabs)
+
+        # Tracker Tab
+        tracker_tab = QWidget()
+        self.tracker_layout(tracker_tab, background_path)
+        self.tabs.addTab(tracker_tab, d.title)
+
+        # Report Tab
+        report_tab = QWidget()
+        self.report_layout(report_tab)
+        self.tabs.addTab(report_tab, "Report")
+
+        # Database reads wait for the first show, or for idle slices when the home screen pre-warms
+        self.pending_loads = self.load_steps()
+
+    def load_steps(self):
+        """The window's initial database reads, in order."""
+        return [self.refresh_goal_label, lambda: self.load_day_data(self.calendar.selectedDate())]
+
+    def load_next(self):
+        """Run the next initial read; returns whether any are left."""
+        if self.pending_loads:
+            self.pending_loads.pop(0)()
+        return bool(self.pending_loads)
+
+    def showEvent(self, event):
+        while self.load_next():
+            pass
+        super().showEvent(event)
+
+    # Layout
+
+    def tracker_layout(self, tab, background_path):
+        """This layout is for the tracker tab."""
+        layout = QVBoxLayout(tab)
+
+        # Set background
+        if background_path:
+            self.set_background(tab, background_path)
+
+        # Title
+        title = QLabel(self.definition.title)
+        title.setFont(QFont("Arial", 18, QFont.Bold))
+        title.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title)
+
+        # Calendar
+        self.calendar = QCalendarWidget()
+        self.calendar.setGridVisible(False)
+        self.calendar.setVerticalHeaderFormat(QCalendarWidget.NoVerticalHeader)
+        self.calendar.setSelectedDate(QDate.currentDate())
+        self.calendar.clicked.connect(self.load_day_data)
+        layout.addWidget(self.calendar)
+
+        self.input_layout(layout)
+
+        # Save Button
+        save_button = QPushButton(self.definition.save_text)
+        save_button.setStyleSheet(SAVE_BUTTON_STYLE)
+        save_button.clicked.connect(self.save_entry)
+        layout.addWidget(save_button, alignment=Qt.AlignCenter)
+
+        # Goal & Streak Summary
+        self.goal_label = QLabel()
+        self.goal_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.goal_label)
+
+        recompute_button = QPushButton("Recompute Goals")
+        recompute_button.clicked.connect(self.recompute_goal)
+        layout.addWidget(recompute_button, alignment=Qt.AlignCenter)
+
+    def input_layout(self, layout):
+        """The label and input widget for the definition's value type."""
+        d = self.definition
+        input_label = QLabel(d.input_label)
+        input_label.setFont(QFont("Arial", 12))
+        layout.addWidget(input_label)
+
+        if d.input_widget == "choice":
+            self.value_edit = QComboBox()
+            for code, name in d.choices:
+                self.value_edit.addItem(name, code)
+        elif d.input_widget == "text":
+            self.value_edit = QTextEdit()
+            self.value_edit.setPlaceholderText(d.input_placeholder)
+        else:
+            self.value_edit = QLineEdit()
+            self.value_edit.setPlaceholderText(d.input_placeholder)
+        layout.addWidget(self.value_edit)
+
+    def report_layout(self, tab):
+        """This layout is for the Report tab."""
+        d = self.definition
+        layout = QVBoxLayout(tab)
+
+        self.report_box = QTextEdit(self)
+        self.report_box.setPlaceholderText("Report will be displayed here...")
+        self.report_box.setReadOnly(True)
+        layout.addWidget(self.report_box)
+
+        # Edit & Delete Layout
+        if d.editable:
+            edit_delete_layout = QHBoxLayout()
+            self.edit_date_input = QLineEdit()
+            self.edit_date_input.setPlaceholderText("Enter Date (yyyy-mm-dd) to Edit/Delete")
+            edit_delete_layout.addWidget(self.edit_date_input)
+
+            edit_button = QPushButton("Edit Record")
+            edit_button.clicked.connect(self.edit_entry)
+            edit_delete_layout.addWidget(edit_button)
+
+            delete_button = QPushButton("Delete Record")
+            delete_button.clicked.connect(self.delete_entry)
+            edit_delete_layout.addWidget(delete_button)
+
+            layout.addLayout(edit_delete_layout)
+
+        # Generate Report Button
+        generate_button = QPushButton("Generate Report")
+        generate_button.clicked.connect(self.generate_report)
+        layout.addWidget(generate_button, alignment=Qt.AlignCenter)
+
+        # Chart Type Selector
+        self.chart_mode = None
+        if len(d.chart_kinds) > 1:
+            chart_mode_layout = QHBoxLayout()
+            chart_mode_layout.addWidget(QLabel("Chart Type:"))
+            self.chart_mode = QComboBox()
+            for kind in d.chart_kinds:
+                self.chart_mode.addItem(CHART_NAMES[kind], kind)
+            chart_mode_layout.addWidget(self.chart_mode)
+            layout.addLayout(chart_mode_layout)
+
+        if d.chart_kinds:
+            chart_button = QPushButton("Show Statistics")
+            chart_button.clicked.connect(self.show_statistics)
+            layout.addWidget(chart_button, alignment=Qt.AlignCenter)
+
+        # Download Report Button
+        pdf_button = QPushButton("Download Report as PDF")
+        pdf_button.clicked.connect(self.download_report_pdf)
+        layout.addWidget(pdf_button, alignment=Qt.AlignCenter)
+
+        self.chart_layout = QVBoxLayout()  # Layout for the chart
+        layout.addLayout(self.chart_layout)
+
+    def set_background(self, widget, background_path):
+        """Set the custom background, an asset name or a path of the user's own."""
+        palette = QPalette()
+        pixmap = image_cache.pixmap(background_path)
+        if not pixmap.isNull():
+            palette.setBrush(QPalette.Window, QBrush(pixmap))
+        widget.setAutoFillBackground(True)
+        widget.setPalette(palette)
+
+    # Goals
+
+    def refresh_goal_label(self):
+        """Show the running streak state, loading it on first use."""
+        if not self.goal.loaded:
+            self.recompute_goal()
+            return
+        self.goal_label.setText(self.goal.summary())
+
+    def recompute_goal(self):
+        """Rebuild the streak state from the full history."""
+        try:
+            self.goal.recompute_from_db(self.db_conn, self.definition.goal_query)
+            self.goal_label.setText(self.goal.summary())
+        except mysql.connector.Error as e:
+            QMessageBox.critical(self, "Error", f"Failed to compute goals: {e}")
+
+    def goal_value(self, value):
+        """The value a day counts with towards the goal; None clears the day."""
+        if value is None or self.definition.input_widget == "number":
+            return value
+        if self.definition.input_widget == "text":
+            return 1.0 if value.strip() else None
+        return 1.0
+
+    # Input
+
+    def input_value(self):
+        """The validated value from the input widget, or None after warning the user."""
+        d = self.definition
+        if d.input_widget == "choice":
+            value = self.value_edit.currentData()
+            if value is None:
+                QMessageBox.warning(self, "Input Error", f"Please select a {d.value_label.lower()}.")
+            return value
+        if d.input_widget == "text":
+            return self.value_edit.toPlainText()
+
+        text = self.value_edit.text().strip()
+        if not text:
+            QMessageBox.warning(self, "Input Error", f"Please enter the {d.value_label.lower()} value.")
+            return None
+        try:
+            value = d.value_type(text)
+        except ValueError:
+            QMessageBox.warning(self, "Input Error", f"Please enter the {d.value_label.lower()} as a number.")
+            return None
+        if value <= 0:
+            QMessageBox.warning(self, "Input Error", "Please enter an amount greater than zero.")
+            return None
+        return value
+
+    def show_value(self, value):
+        """Put a stored value (or None for an empty day) into the input widget."""
+        d = self.definition
+        if d.input_widget == "choice":
+            self.value_edit.setCurrentIndex(max(self.value_edit.findData(value), 0))
+        elif value is None:
+            self.value_edit.clear()
+        elif d.input_widget == "text":
+            self.value_edit.setPlainText(value)
+        else:
+            self.value_edit.setText(f"{value:g}")
+
+    def ask_value(self, title):
+        """Prompt for a replacement value; returns (value, ok)."""
+        d = self.definition
+        label = d.value_label.lower()
+        if d.input_widget == "choice":
+            names = [name for _, name in d.choices]
+            name, ok = QInputDialog.getItem(self, title, f"Choose the {label}:", names, 0, False)
+            return {name: code for code, name in d.choices}.get(name), ok
+        if d.input_widget == "text":
+            return QInputDialog.getMultiLineText(self, title, f"Enter the new {label}:")
+        if d.value_type is int:
+            return QInputDialog.getInt(self, title, f"Enter new {label} ({d.unit}):", 0, 0, int(d.maximum))
+        return QInputDialog.getDouble(self, title, f"Enter new {label} ({d.unit}):", 0, 0, d.maximum, 1)
+
+    # Storage hooks; each runs inside the caller's transaction
+
+    def write_entry(self, cursor, date, value):
+        """Store a saved value for the day; returns the day's value afterwards."""
+        d = self.definition
+        if d.events:
+            logged_at = f"{date} {QTime.currentTime().toString('HH:mm:ss')}"
+            cursor.execute(f"INSERT INTO {d.table} ({d.date_column}, {d.value_column}) VALUES (%s, %s)",
+                           (logged_at, value))
+        else:
+            cursor.execute(f"REPLACE INTO {d.table} ({d.date_column}, {d.value_column}) VALUES (%s, %s)",
+                           (date, value))
+        return value
+
+    def write_edit(self, cursor, date, value):
+        """Replace the day's value (an event day's latest entry); returns whether a row changed."""
+        d = self.definition
+        query = f"UPDATE {d.table} SET {d.value_column} = %s WHERE {d.day_filter()}"
+        if d.events:
+            query += f" ORDER BY {d.date_column} DESC LIMIT 1"
+        cursor.execute(query, (value,) + d.day_params(date))
+        return cursor.rowcount > 0
+
+    def write_delete(self, cursor, date):
+        """Delete everything stored for the day; returns whether anything was there."""
+        d = self.definition
+        cursor.execute(f"DELETE FROM {d.table} WHERE {d.day_filter()}", d.day_params(date))
+        return cursor.rowcount > 0
+
+    def entry_saved(self, date, value):
+        """Called after a save from the tracker tab, with the day's new value."""
+
+    def entry_changed(self, date, value):
+        """Called after any save, edit or delete; value is None once the day is deleted."""
+
+    # Actions
+
+    def load_day_data(self, date):
+        """Load data for the selected day."""
+        d = self.definition
+        try:
+            cursor = self.db_conn.cursor()
+            query = f"""
+                SELECT {d.value_column}
+                FROM {d.table}
+                WHERE {d.day_filter()}
+                ORDER BY {d.date_column} DESC
+                LIMIT 1
+            """
+            cursor.execute(query, d.day_params(date.toString("yyyy-MM-dd")))
+            result = cursor.fetchone()
+            self.show_value(result[0] if result else None)
+        except mysql.connector.Error as e:
+            QMessageBox.critical(self, "Error", f"Failed to load data: {e}")
+
+    def save_entry(self):
+        """Save the value in the input widget for the selected day."""
+        value = self.input_value()
+        if value is None:
+            return
+        self.store_entry(self.calendar.selectedDate().toString("yyyy-MM-dd"), value)
+
+    @profiling.action("save")
+    def store_entry(self, date, value):
+        try:
+            cursor = self.db_conn.cursor()
+            day_value = self.write_entry(cursor, date, value)
+            self.db_conn.commit()
+        except mysql.connector.Error as e:
+            self.db_conn.rollback()
+            QMessageBox.critical(self, "Error", f"Failed to save entry: {e}")
+            return
+
+        self.goal.record(date, self.goal_value(day_value))
+        self.refresh_goal_label()
+        self.entry_changed(date, day_value)
+        self.entry_saved(date, day_value)
+        self.load_day_data(self.calendar.selectedDate())
+
+        if self.definition.input_widget == "text":
+            QMessageBox.information(self, "Success", f"Entry saved for {date}.")
+        else:
+            QMessageBox.information(self, "Success",
+                                    f"{self.definition.value_label} saved for {date}: "
+                                    f"{self.definition.format_value(value)}")
+
+    def edit_entry(self):
+        """Edit a specific record."""
+        date = self.edit_date_input.text()
+        value, ok = self.ask_value("Edit Record")
+        if not (ok and date):
+            return
+        try:
+            cursor = self.db_conn.cursor()
+            changed = self.write_edit(cursor, date, value)
+            self.db_conn.commit()
+        except mysql.connector.Error as e:
+            self.db_conn.rollback()
+            QMessageBox.critical(self, "Error", f"Failed to edit record: {e}")
+            return
+
+        if changed:
+            self.goal.record(date, self.goal_value(value))
+            self.refresh_goal_label()
+            self.entry_changed(date, value)
+        QMessageBox.information(self, "Success", f"Record for {date} updated successfully!")
+        self.generate_report()
+
+    def delete_entry(self):
+        """Delete a specific record."""
+        date = self.edit_date_input.text()
+        if not date:
+            return
+        try:
+            cursor = self.db_conn.cursor()
+            deleted = self.write_delete(cursor, date)
+            self.db_conn.commit()
+        except mysql.connector.Error as e:
+            self.db_conn.rollback()
+            QMessageBox.critical(self, "Error", f"Failed to delete record: {e}")
+            return
+
+        if deleted:
+            self.goal.remove(date)
+            self.refresh_goal_label()
+            self.entry_changed(date, None)
+        QMessageBox.information(self, "Success", f"Record for {date} deleted successfully!")
+        self.generate_report()
+
+    # Reports
+
+    def period_range(self, period):
+        """(start, end) yyyy-MM-dd strings for a report period ending today."""
+        today = QDate.currentDate()
+        return PERIODS[period](today).toString("yyyy-MM-dd"), today.toString("yyyy-MM-dd")
+
+    def fetch_rows(self, start_date, end_date):
+        """(date, value) rows in the range, oldest first."""
+        d = self.definition
+        cursor = self.db_conn.cursor()
+        query = f"""
+            SELECT {d.date_column}, {d.value_column}
+            FROM {d.table}
+            WHERE {d.range_filter()}
+            ORDER BY {d.date_column}
+        """
+        cursor.execute(query, (start_date, end_date))
+        return cursor.fetchall()
+
+    def has_rows(self, start_date, end_date):
+        """Whether anything was stored in the range, without reading it all."""
+        d = self.definition
+        cursor = self.db_conn.cursor()
+        cursor.execute(f"SELECT 1 FROM {d.table} WHERE {d.range_filter()} LIMIT 1", (start_date, end_date))
+        return bool(cursor.fetchall())
+
+    def report_line(self, row):
+        when, value = row
+        d = self.definition
+        return f"Date: {d.format_date(when)} | {d.value_label}: {d.format_value(value)}"
+
+    @profiling.action("report")
+    def generate_report(self):
+        """Generate a textual report of the last week."""
+        try:
+            start_date, end_date = self.period_range("This Week")
+            results = self.fetch_rows(start_date, end_date)
+
+            report = f"{self.definition.report_title} from {start_date} to {end_date}:\n\n"
+            report += "".join(self.report_line(row) + "\n" for row in results)
+            self.report_box.setPlainText(report)
+        except mysql.connector.Error as e:
+            QMessageBox.critical(self, "Error", f"Failed to generate report: {e}")
+
+    @profiling.action("pdf")
+    def download_report_pdf(self):
+        """Download the report for a chosen period as a PDF."""
+        d = self.definition
+        try:
+            period = d.report_periods[0]
+            if len(d.report_periods) > 1:
+                period, ok = QInputDialog.getItem(self, "Select Report Period", "Choose the report period:",
+                                                  list(d.report_periods), 0, False)
+                if not ok:
+                    return
+
+            start_date, end_date = self.period_range(period)
+            if not self.has_rows(start_date, end_date):
+                QMessageBox.warning(self, "No Data", f"No {d.key} data available for the selected period.")
+                return
+
+            file_path, _ = QFileDialog.getSaveFileName(self, "Save Report", f"{d.key.title()}_Report.pdf",
+                                                       "PDF Files (*.pdf)")
+            if not file_path:
+                return
+            started = time.perf_counter()
+
+            if period == "All Entries":
+                title = f"{d.report_title} (All Entries)"
+            else:
+                title = f"{d.report_title} from {start_date} to {end_date}"
+            self.write_pdf(file_path, start_date, end_date, title)
+            metrics.observe("wellhive_pdf_generation_seconds", time.perf_counter() - started, tracker=d.key)
+            QMessageBox.information(self, "Success", "Report saved successfully as PDF.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save PDF: {e}")
+
+    def write_pdf(self, file_path, start_date, end_date, title):
+        """Lay out the report lines on canvas pages over the optional background."""
+        results = self.fetch_rows(start_date, end_date)
+        background = image_cache.image_reader(self.definition.pdf_background) if self.definition.pdf_background else None
+
+        with timeline.span("pdf.layout"):
+            pdf = canvas.Canvas(file_path, pagesize=letter)
+            width, height = letter
+
+            if background is not None:
+                pdf.drawImage(background, 0, 0, width=width, height=height, mask='auto')
+
+            pdf.setFont("Helvetica-Bold", 14)
+            pdf.drawString(50, height - 50, title)
+
+            y = height - 100
+            pdf.setFont("Helvetica", 12)
+            for row in results:
+                pdf.drawString(50, y, self.report_line(row))
+                y -= 20
+                if y < 50:
+                    pdf.showPage()
+                    y = height - 50
+
+        with timeline.span("pdf.write"):
+            pdf.save()
+
+    # Charts
+
+    def chart_data(self, kind):
+        """(labels, values) for a chart: counts per choice over the last week, else the full history."""
+        d = self.definition
+        cursor = self.db_conn.cursor()
+        if d.input_widget == "choice":
+            query = f"""
+                SELECT {d.value_column}, COUNT(*)
+                FROM {d.table}
+                WHERE {d.range_filter()}
+                GROUP BY {d.value_column}
+            """
+            cursor.execute(query, self.period_range("This Week"))
+            results = cursor.fetchall()
+            return [d.names.get(row[0], "Unknown") for row in results], [row[1] for row in results]
+
+        cursor.execute(f"SELECT {d.date_column}, {d.value_column} FROM {d.table} ORDER BY {d.date_column}")
+        results = cursor.fetchall()
+        return [row[0] for row in results], [row[1] for row in results]
+
+    @profiling.action("statistics")
+    def show_statistics(self):
+        """Draw the selected chart into the Report tab."""
+        started = time.perf_counter()
+        try:
+            self.draw_statistics()
+        finally:
+            metrics.observe("wellhive_chart_render_seconds", time.perf_counter() - started,
+                            tracker=self.definition.key)
+
+    def draw_statistics(self):
+        d = self.definition
+        kind = self.chart_mode.currentData() if self.chart_mode is not None else d.chart_kinds[0]
+        try:
+            labels, values = self.chart_data(kind)
+        except mysql.connector.Error as e:
+            QMessageBox.critical(self, "Error", f"Failed to show statistics: {e}")
+            return
+
+        if not values:
+            QMessageBox.warning(self, "No Data", "No data available to display in the chart.")
+            return
+
+        fig = Figure()
+        ax = fig.add_subplot(111)
+        if kind == "pie":
+            ax.pie(values, labels=labels, autopct="%1.1f%%", startangle=90, colors=PIE_COLORS)
+            ax.set_title(f"{d.value_label} Distribution")
+        else:
+            if kind == "area":
+                self.plot_trend(ax, labels, values, d.chart_color)
+            else:
+                ax.bar(labels, values, color=d.chart_color)
+            ax.set_title(f"{d.value_label} Statistics")
+            if d.input_widget == "number":
+                ax.set_xlabel("Dates")
+                ax.set_ylabel(f"{d.value_label} ({d.unit})" if d.unit else d.value_label)
+
+        chart = FigureCanvas(fig)
+        chart.setMinimumSize(600, 400)
+
+        # Clear previous charts
+        for i in range(self.chart_layout.count()):
+            widget = self.chart_layout.itemAt(i).widget()
+            if widget:
+                widget.deleteLater()
+
+        self.chart_layout.addWidget(chart)
+        self.chart_figure = fig
+
+        download_button = QPushButton("Download Chart", self)
+        download_button.clicked.connect(self.download_chart)
+        self.chart_layout.addWidget(download_button)
+
+    def plot_trend(self, ax, dates, values, color):
+        """Plot the series as an area chart, downsampled to the canvas width with LTTB."""
+        width_px = max(self.tabs.width(), 600)
+        x, y = downsample_dates(dates, values, width_px)
+        ax.fill_between(x, y, color=color, alpha=0.3)
+        ax.plot(x, y, color=color, linewidth=1)
+        ax.figure.autofmt_xdate()
+
+    def download_chart(self):
+        """Save the chart on screen as an image (PNG or JPEG)."""
+        if self.chart_figure is None:
+            return
+        try:
+            file_path, _ = QFileDialog.getSaveFileName(self, "Save Chart", "chart.png",
+                                                       "PNG Files (*.png);;JPEG Files (*.jpg)")
+            if not file_path:
+                return
+            self.chart_figure.savefig(file_path, bbox_inches='tight')
+            QMessageBox.information(self, "Success", "Chart saved successfully.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save the chart: {e}")
@@ -0,0 +1,126 @@
+import importlib
+import json
+import os
+import runpy
+import signal
+import subprocess
+import sys
+from PySide6.QtCore import QObject, QProcess
+import timeline
+
+ZYGOTE_SCRIPT = os.path.abspath(__file__)
+
+# Imported once in the zygote and shared copy-on-write by every forked tracker.
+# Nothing here may start a thread or create the QApplication: only the forking thread survives a fork.
+PRELOAD = (
+    "PySide6.QtWidgets", "PySide6.QtGui", "PySide6.QtMultimedia",
+    "matplotlib.figure", "matplotlib.backends.backend_qt5agg",
+    "reportlab.pdfgen.canvas", "reportlab.platypus", "mysql.connector",
+    "mood", "Sleep", "Water_tracker", "gra", "med", "reminder",
+)
+
+
+def supported():
+    """Forking a process with Qt loaded is only safe on Linux; elsewhere trackers cold-start."""
+    return (sys.platform.startswith("linux") and hasattr(os, "fork")
+            and os.environ.get("WELLHIVE_ZYGOTE", "1") != "0")
+
+
+def serve(requests, replies):
+    """Preload, then fork one tracker per request line until the launcher closes the pipe.
+
+    Each request is {"script": path, "args": [...]}; the reply is the child's pid.
+    """
+    for name in PRELOAD:
+        try:
+            importlib.import_module(name)
+        except ImportError as e:
+            print(f"zygote: could not preload {name}: {e}", file=sys.stderr)
+
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # the kernel reaps exited trackers
+    replies.write("ready\n")
+    replies.flush()
+
+    for line in requests:
+        request = json.loads(line)
+        pid = os.fork()
+        if pid == 0:
+            run_child(request, requests, replies)
+        replies.write(f"{pid}\n")
+        replies.flush()
+
+
+def run_child(request, requests, replies):
+    """Run the tracker script as __main__ in the forked child; its sys.exit ends the process."""
+    requests.close()
+    replies.close()
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    timeline.forget_inherited()
+    os.setsid()  # outlives the zygote and the home screen, like a separately started script
+
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    sys.stdin = open(os.devnull)
+
+    script = request["script"]
+    sys.argv = [script] + request["args"]
+    sys.path[0] = os.path.dirname(os.path.abspath(script))
+    runpy.run_path(script, run_name="__main__")
+    sys.exit(0)
+
+
+class ZygoteLauncher(QObject):
+    """Opens tracker scripts in their own processes, forked from a warm zygote.
+
+    The zygote starts in the background with the given arguments and is used
+    once it reports ready; until then, or where forking is unsupported, each
+    launch cold-starts a new interpreter.
+    """
+
+    def __init__(self, args=(), parent=None):
+        super().__init__(parent)
+        self.ready = False
+        self.buffer = b""
+        self.pending = []  # (script name, request time) awaiting a pid reply
+        self.process = None
+        if supported():
+            self.process = QProcess(self)
+            self.process.setProcessChannelMode(QProcess.ForwardedErrorChannel)
+            self.process.readyReadStandardOutput.connect(self.read_replies)
+            self.process.finished.connect(self.zygote_finished)
+            self.process.start(sys.executable, [ZYGOTE_SCRIPT] + list(args))
+
+    def launch(self, script, args=()):
+        if not self.ready:
+            with timeline.span(f"launch.popen {os.path.basename(script)}", "launch"):
+                subprocess.Popen([sys.executable, script] + list(args))
+            return
+        self.pending.append((os.path.basename(script), timeline.now_us()))
+        request = json.dumps({"script": script, "args": list(args)}) + "\n"
+        self.process.write(request.encode("utf-8"))
+
+    def read_replies(self):
+        self.buffer += bytes(self.process.readAllStandardOutput())
+        *lines, self.buffer = self.buffer.split(b"\n")
+        for line in lines:
+            if line == b"ready":
+                self.ready = True
+            elif self.pending:
+                name, requested = self.pending.pop(0)
+                timeline.complete(f"launch.fork {name}", requested, timeline.now_us() - requested, "launch",
+                                  pid=int(line))
+
+    def zygote_finished(self):
+        if self.ready:
+            print("Tracker zygote exited; starting trackers with a fresh interpreter", file=sys.stderr)
+        self.ready = False
+        self.pending = []
+
+
+if __name__ == "__main__":
+    # Replies go over a private copy of stdout; fd 1 then points at stderr,
+    # so output from the zygote and its trackers reaches the console instead of the pipe.
+    replies = os.fdopen(os.dup(1), "w")
+    os.dup2(2, 1)
+    serve(sys.stdin, replies)